@@ -1,10 +1,11 @@
 import pandas as pd
+from modules.channel_db import channel_index, load_channels, save_channels
 
-# Load the current database
-df = pd.read_excel('channel_database.xlsx', sheet_name='Channels')
-
-# Check if PBS already exists
-if 'PBS' not in df['Channel'].values:
+# Check if PBS already exists (no spreadsheet parse if the index is warm)
+if 'pbs' not in channel_index():
+    # Load the current database
+    df = load_channels()
+    
     # Add PBS channel
     new_row = pd.DataFrame({
         'Channel': ['PBS'],
@@ -18,7 +19,7 @@ if 'PBS' not in df['Channel'].values:
     df = df.sort_values('Channel').reset_index(drop=True)
     
     # Save back to Excel
-    df.to_excel('channel_database.xlsx', index=False, sheet_name='Channels')
+    save_channels(df)
     print("Added PBS channel to database")
     
     # Verify it was added
@@ -26,4 +27,4 @@ if 'PBS' not in df['Channel'].values:
     print("\nPBS-related channels now in database:")
     print(pbs_entries[['Channel', 'Website']].to_string())
 else:
-    print("PBS already exists in database")
\ No newline at end of file
+    print("PBS already exists in database")
@@ -1,55 +1,126 @@
 from flask import Flask, render_template, request, jsonify, send_file
 from flask_cors import CORS
 from flask_caching import Cache
+from flask_compress import Compress
 from config import Config
 import os
+import io
+import json
+import hashlib
 import logging
 from datetime import datetime
+from functools import lru_cache, wraps
+from typing import Dict
 
-# Import modules (to be created)
-from modules.scraper import TVInsiderScraper
-from modules.link_generator import LinkGenerator
-from modules.ai_content import AIContentGenerator
-from modules.image_generator import ImageGenerator
-from modules.newsletter_builder import NewsletterBuilder
+from utils.session_store import SessionStore
+from utils.json_provider import OrjsonProvider
+from utils.task_queue import TaskQueue
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Working directories the app writes into
+REQUIRED_DIRS = [
+    Config.TEMP_FOLDER,
+    Config.ASSETS_FOLDER,
+    *(os.path.join(Config.STATIC_FOLDER, d) for d in ('css', 'js', 'banners', 'fonts'))
+]
+
 # Initialize Flask app
 app = Flask(__name__)
 app.config.from_object(Config)
+app.json = OrjsonProvider(app)
+
+def init_app(app):
+    """Configure logging, validate settings and create working directories."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    # Validate configuration
+    config_errors = Config.validate()
+    if config_errors:
+        logger.warning(f"Configuration warnings: {', '.join(config_errors)}")
+    
+    # Create necessary directories once per process
+    if not app.config.get('_DIRS_READY'):
+        for directory in REQUIRED_DIRS:
+            if not os.path.isdir(directory):
+                os.makedirs(directory, exist_ok=True)
+        app.config['_DIRS_READY'] = True
+    
+    # Compile the UI template at boot so the first request doesn't pay for it; the
+    # cache is unbounded (cache_size=-1) since the app only has a handful of templates
+    app.jinja_options = {**app.jinja_options, 'cache_size': -1}
+    app.jinja_env.get_template('index.html')
 
-# Validate configuration
-config_errors = Config.validate()
-if config_errors:
-    logger.warning(f"Configuration warnings: {', '.join(config_errors)}")
+init_app(app)
 
 # Initialize extensions
 CORS(app)
 cache = Cache(app)
+Compress(app)
+
+# Service modules are imported and built on first use so that workers boot
+# quickly and lightweight endpoints like /health never load Selenium or OpenAI
+@lru_cache(maxsize=None)
+def get_scraper():
+    from modules.scraper import TVInsiderScraper
+    return TVInsiderScraper()
+
+@lru_cache(maxsize=None)
+def get_link_generator():
+    from modules.link_generator import LinkGenerator
+    return LinkGenerator()
+
+@lru_cache(maxsize=None)
+def get_ai_generator():
+    from modules.ai_content import AIContentGenerator
+    return AIContentGenerator(Config.OPENAI_API_KEY)
+
+@lru_cache(maxsize=None)
+def get_newsletter_builder():
+    from modules.newsletter_builder import NewsletterBuilder
+    return NewsletterBuilder()
+
+# Session storage (Redis when REDIS_URL is set)
+session_store = SessionStore()
+
+# Banner generation runs off the request thread
+banner_queue = TaskQueue('banners')
+
+class SessionMissing(Exception):
+    """Raised when a request refers to a session that does not exist."""
 
-# Create necessary directories
-os.makedirs(Config.TEMP_FOLDER, exist_ok=True)
-os.makedirs(Config.ASSETS_FOLDER, exist_ok=True)
-os.makedirs(os.path.join(Config.STATIC_FOLDER, 'css'), exist_ok=True)
-os.makedirs(os.path.join(Config.STATIC_FOLDER, 'js'), exist_ok=True)
-os.makedirs(os.path.join(Config.STATIC_FOLDER, 'banners'), exist_ok=True)
-os.makedirs(os.path.join(Config.STATIC_FOLDER, 'fonts'), exist_ok=True)
+def get_session(session_id: str, message: str = 'No session data found') -> Dict:
+    """Load session data or raise SessionMissing."""
+    session_data = session_store.get(session_id)
+    if session_data is None:
+        raise SessionMissing(message)
+    return session_data
 
-# Initialize service modules
-scraper = TVInsiderScraper()
-link_generator = LinkGenerator()
-ai_generator = AIContentGenerator(Config.OPENAI_API_KEY)
-image_generator = ImageGenerator(Config.FLUX_API_KEY, Config.FLUX_API_URL)
-newsletter_builder = NewsletterBuilder()
+def api_endpoint(error_prefix: str = None):
+    """Turn errors raised by an API handler into JSON error responses."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                return fn(*args, **kwargs)
+            except SessionMissing as e:
+                logger.error(f"{fn.__name__}: {str(e)}")
+                return jsonify({'error': str(e)}), 400
+            except Exception as e:
+                logger.exception(f"{fn.__name__} failed")
+                message = f"{error_prefix}: {str(e)}" if error_prefix else str(e)
+                return jsonify({'error': message}), 500
+        return wrapper
+    return decorator
 
-# Session storage (in production, use Redis or database)
-sessions = {}
+def _ai_cache_key(kind: str, context: Dict, count: int) -> str:
+    """Build a cache key from the inputs that determine an AI generation."""
+    payload = json.dumps(context, sort_keys=True, default=str)
+    digest = hashlib.sha256(f"{payload}|{get_ai_generator().model}|{count}".encode()).hexdigest()
+    return f"ai:{kind}:{digest}"
 
 @app.route('/')
 def index():
@@ -57,350 +128,347 @@ def index():
     return render_template('index.html')
 
 @app.route('/api/scrape', methods=['POST'])
+@api_endpoint()
 def scrape_content():
     """Scrape TVInsider for content within date range."""
+    data = request.json
+    start_date = data.get('start_date')
+    end_date = data.get('end_date')
+    
+    if not start_date or not end_date:
+        return jsonify({'error': 'Start and end dates are required'}), 400
+    
+    # Validate date range (fromisoformat parses YYYY-MM-DD without strptime's regex machinery)
+    start = datetime.fromisoformat(start_date)
+    end = datetime.fromisoformat(end_date)
+    
+    if (end - start).days > 30:
+        return jsonify({'error': 'Date range cannot exceed 30 days'}), 400
+    
+    if start > end:
+        return jsonify({'error': 'Start date must be before end date'}), 400
+    
+    # Perform scraping
+    logger.info(f"Starting scrape for {start_date} to {end_date}")
+    
     try:
-        data = request.json
-        start_date = data.get('start_date')
-        end_date = data.get('end_date')
-        
-        if not start_date or not end_date:
-            return jsonify({'error': 'Start and end dates are required'}), 400
-        
-        # Validate date range
-        start = datetime.strptime(start_date, '%Y-%m-%d')
-        end = datetime.strptime(end_date, '%Y-%m-%d')
-        
-        if (end - start).days > 30:
-            return jsonify({'error': 'Date range cannot exceed 30 days'}), 400
-        
-        if start > end:
-            return jsonify({'error': 'Start date must be before end date'}), 400
-        
-        # Perform scraping
-        logger.info(f"Starting scrape for {start_date} to {end_date}")
-        
-        try:
-            results = scraper.scrape_date_range(start_date, end_date)
-        except Exception as scrape_error:
-            logger.error(f"Scraping failed: {str(scrape_error)}")
-            error_message = str(scrape_error)
-            
-            # Provide helpful error messages
-            if "cannot connect" in error_message.lower() or "connection" in error_message.lower():
-                return jsonify({
-                    'error': 'Connection Error: Unable to reach TVInsider.com. Please check your internet connection and try again.'
-                }), 500
-            elif "chrome" in error_message.lower():
-                return jsonify({
-                    'error': 'Chrome Browser Error: Please ensure Google Chrome is installed on your system. If the issue persists, try setting HEADLESS_BROWSER=false in your .env file.'
-                }), 500
-            else:
-                return jsonify({'error': f'Scraping failed: {error_message}'}), 500
-        
-        # Normalize website URLs for scraped content
-        for item in results:
-            website = item.get('website', '')
-            if website:
-                item['website_url'] = link_generator.normalize_website_url(website)
-            else:
-                item['website_url'] = '#'
-        
-        # Store in session
-        session_id = request.headers.get('X-Session-Id', 'default')
-        sessions[session_id] = {
-            'scraped_data': results,
-            'date_range': {'start': start_date, 'end': end_date}
-        }
-        
-        return jsonify({
-            'success': True,
-            'count': len(results),
-            'data': results
-        })
+        results = get_scraper().scrape_date_range(start_date, end_date)
+    except Exception as scrape_error:
+        logger.error(f"Scraping failed: {str(scrape_error)}")
+        error_message = str(scrape_error)
         
-    except Exception as e:
-        logger.error(f"Scraping error: {str(e)}")
-        error_message = str(e)
-        
-        # Check for timeout errors
+        # Provide helpful error messages
         if 'timeout' in error_message.lower() or 'timed out' in error_message.lower():
             return jsonify({
                 'error': 'timeout',
                 'message': 'The website took too long to respond. This might be due to slow internet or high website traffic. Please try again or select a different date range.',
                 'user_message': 'Request timed out. Please try again or select different dates.'
             }), 504  # Gateway Timeout
-        
-        return jsonify({'error': error_message}), 500
+        elif "cannot connect" in error_message.lower() or "connection" in error_message.lower():
+            return jsonify({
+                'error': 'Connection Error: Unable to reach TVInsider.com. Please check your internet connection and try again.'
+            }), 500
+        elif "chrome" in error_message.lower():
+            return jsonify({
+                'error': 'Chrome Browser Error: Please ensure Google Chrome is installed on your system. If the issue persists, try setting HEADLESS_BROWSER=false in your .env file.'
+            }), 500
+        else:
+            return jsonify({'error': f'Scraping failed: {error_message}'}), 500
+    
+    # Normalize website URLs for scraped content in one batch
+    websites = [item.get('website', '') for item in results]
+    for item, website_url in zip(results, get_link_generator().normalize_website_urls(websites)):
+        item['website_url'] = website_url
+    
+    # Compact summaries feed the AI prompts so full items aren't re-sent downstream
+    summaries = [
+        {
+            'name': item.get('name', ''),
+            'channel': item.get('channel', ''),
+            'synopsis': item.get('description', '')[:140]
+        }
+        for item in results
+    ]
+    
+    # Store in session
+    session_id = request.headers.get('X-Session-Id', 'default')
+    session_store.set(session_id, {
+        'scraped_data': results,
+        'summaries': summaries,
+        'date_range': {'start': start_date, 'end': end_date}
+    })
+    
+    return jsonify({
+        'success': True,
+        'count': len(results),
+        'data': results
+    })
 
 @app.route('/api/select-content', methods=['POST'])
+@api_endpoint()
 def select_content():
     """Save selected content items for newsletter."""
-    try:
-        data = request.json
-        session_id = request.headers.get('X-Session-Id', 'default')
-        
-        if session_id not in sessions:
-            return jsonify({'error': 'No session data found'}), 400
-        
-        selected_ids = data.get('selected_items', [])
-        session_data = sessions[session_id]
-        
-        # Filter scraped data to only include selected items
-        all_items = session_data.get('scraped_data', [])
-        selected_items = [item for i, item in enumerate(all_items) if str(i) in selected_ids]
-        
-        session_data['selected_content'] = selected_items
-        
-        return jsonify({
-            'success': True,
-            'selected_count': len(selected_items)
-        })
-        
-    except Exception as e:
-        logger.error(f"Content selection error: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+    data = request.json
+    session_id = request.headers.get('X-Session-Id', 'default')
+    session_data = get_session(session_id)
+    
+    selected_ids = data.get('selected_items', [])
+    
+    # Filter scraped data to only include selected items
+    all_items = session_data.get('scraped_data', [])
+    selected_items = [item for i, item in enumerate(all_items) if str(i) in selected_ids]
+    
+    session_store.update(session_id, {'selected_content': selected_items})
+    
+    return jsonify({
+        'success': True,
+        'selected_count': len(selected_items)
+    })
 
 @app.route('/api/generate-taglines', methods=['POST'])
+@api_endpoint('Failed to generate taglines')
 def generate_taglines():
     """Generate AI tagline options."""
-    try:
-        # Handle both empty and non-empty request body
-        data = request.json if request.json else {}
-        session_id = request.headers.get('X-Session-Id', 'default')
-        
-        logger.info(f"Generating taglines for session: {session_id}")
-        
-        if session_id not in sessions:
-            logger.error(f"Session {session_id} not found in sessions")
-            return jsonify({'error': 'No session data found. Please scrape content first.'}), 400
-        
-        session_data = sessions[session_id]
-        # Use selected content if available, otherwise use all scraped data
-        content_to_use = session_data.get('selected_content', session_data.get('scraped_data', []))
-        
-        if not content_to_use:
-            logger.error("No content available for tagline generation")
-            return jsonify({'error': 'No content available. Please scrape content first.'}), 400
-        
-        context = {
-            'date_range': session_data.get('date_range', {}),
-            'content_count': len(content_to_use),
-            'highlights': [item.get('name', '') for item in content_to_use[:5] if item.get('name')]
-        }
-        
-        logger.info(f"Generating taglines with context: {context}")
-        
-        taglines = ai_generator.generate_taglines(context, count=3)
-        
-        session_data['taglines'] = taglines
-        
-        logger.info(f"Successfully generated {len(taglines)} taglines")
-        
-        return jsonify({
-            'success': True,
-            'taglines': taglines
-        })
-        
-    except Exception as e:
-        logger.error(f"Tagline generation error: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
-        return jsonify({'error': f'Failed to generate taglines: {str(e)}'}), 500
+    # Handle both empty and non-empty request body
+    data = request.json if request.json else {}
+    session_id = request.headers.get('X-Session-Id', 'default')
+    
+    logger.info(f"Generating taglines for session: {session_id}")
+    
+    session_data = get_session(session_id, 'No session data found. Please scrape content first.')
+    
+    # Use selected content if available, otherwise use all scraped data
+    content_to_use = session_data.get('selected_content', session_data.get('scraped_data', []))
+    
+    if not content_to_use:
+        logger.error("No content available for tagline generation")
+        return jsonify({'error': 'No content available. Please scrape content first.'}), 400
+    
+    context = {
+        'date_range': session_data.get('date_range', {}),
+        'content_count': len(content_to_use),
+        'highlights': [item.get('name', '') for item in content_to_use[:5] if item.get('name')]
+    }
+    
+    logger.info(f"Generating taglines with context: {context}")
+    
+    # Reuse earlier completions for the same content unless regenerating
+    cache_key = _ai_cache_key('taglines', context, 3)
+    taglines = None if data.get('regenerate') else cache.get(cache_key)
+    if taglines is None:
+        taglines = get_ai_generator().generate_taglines(context, count=3)
+        cache.set(cache_key, taglines, timeout=Config.AI_CACHE_TIMEOUT)
+    else:
+        logger.info("Using cached taglines")
+    
+    session_store.update(session_id, {'taglines': taglines})
+    
+    logger.info(f"Successfully generated {len(taglines)} taglines")
+    
+    return jsonify({
+        'success': True,
+        'taglines': taglines
+    })
 
 @app.route('/api/generate-intros', methods=['POST'])
+@api_endpoint()
 def generate_intros():
     """Generate AI introduction options."""
-    try:
-        data = request.json
-        session_id = request.headers.get('X-Session-Id', 'default')
-        
-        if session_id not in sessions:
-            return jsonify({'error': 'No session data found'}), 400
-        
-        session_data = sessions[session_id]
-        selected_tagline = data.get('selected_tagline', '')
-        
-        context = {
-            'tagline': selected_tagline,
-            'date_range': session_data['date_range'],
-            'content': session_data['scraped_data'][:10]
-        }
-        
-        intros = ai_generator.generate_introductions(context, count=3)
-        
-        session_data['intros'] = intros
-        session_data['selected_tagline'] = selected_tagline
-        
-        return jsonify({
-            'success': True,
-            'introductions': intros
-        })
-        
-    except Exception as e:
-        logger.error(f"Introduction generation error: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+    data = request.json
+    session_id = request.headers.get('X-Session-Id', 'default')
+    
+    session_data = get_session(session_id)
+    
+    selected_tagline = data.get('selected_tagline', '')
+    
+    context = {
+        'tagline': selected_tagline,
+        'date_range': session_data['date_range'],
+        'content': session_data.get('summaries', [])[:10]
+    }
+    
+    cache_key = _ai_cache_key('intros', context, 3)
+    intros = None if data.get('regenerate') else cache.get(cache_key)
+    if intros is None:
+        intros = get_ai_generator().generate_introductions(context, count=3)
+        cache.set(cache_key, intros, timeout=Config.AI_CACHE_TIMEOUT)
+    else:
+        logger.info("Using cached introductions")
+    
+    session_store.update(session_id, {
+        'intros': intros,
+        'selected_tagline': selected_tagline
+    })
+    
+    return jsonify({
+        'success': True,
+        'introductions': intros
+    })
 
 @app.route('/api/generate-banners', methods=['POST'])
+@api_endpoint()
 def generate_banners():
-    """Generate banner images with AI."""
-    try:
-        data = request.json
-        session_id = request.headers.get('X-Session-Id', 'default')
-        
-        if session_id not in sessions:
-            return jsonify({'error': 'No session data found'}), 400
-        
-        session_data = sessions[session_id]
-        selected_intro = data.get('selected_intro', '')
-        
-        # Generate banner variations
-        banners = image_generator.generate_banners(
-            tagline=session_data.get('selected_tagline', ''),
-            theme_context=session_data['scraped_data'][:5]
-        )
-        
-        session_data['banners'] = banners
-        session_data['selected_intro'] = selected_intro
-        
-        return jsonify({
-            'success': True,
-            'banners': banners
-        })
-        
-    except Exception as e:
-        logger.error(f"Banner generation error: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+    """Queue banner image generation and return the job id."""
+    data = request.json
+    session_id = request.headers.get('X-Session-Id', 'default')
+    
+    session_data = get_session(session_id)
+    
+    # Recorded now rather than by the job, so it is kept even if banner generation fails
+    session_store.update(session_id, {'selected_intro': data.get('selected_intro', '')})
+    
+    # Generate banner variations in the background
+    job_id = banner_queue.enqueue(
+        'tasks.generate_banners_job',
+        session_id,
+        session_data.get('selected_tagline', ''),
+        session_data.get('summaries', [])[:5],
+        job_timeout=Config.BANNER_JOB_TIMEOUT
+    )
+    
+    return jsonify({
+        'success': True,
+        'job_id': job_id
+    }), 202
+
+@app.route('/api/banners/status/<job_id>', methods=['GET'])
+@api_endpoint()
+def banner_status(job_id):
+    """Get the status of a banner generation job."""
+    job = banner_queue.status(job_id)
+    
+    if job is None:
+        return jsonify({'error': 'Banner job not found'}), 404
+    
+    if job['status'] == 'failed':
+        logger.error(f"Banner job {job_id} failed: {job['error']}")
+        return jsonify({'error': f"Banner generation failed: {job['error']}"}), 500
+    
+    response = {
+        'success': True,
+        'status': job['status']
+    }
+    if job['status'] == 'finished':
+        response['banners'] = job['result']
+    
+    return jsonify(response)
 
 @app.route('/api/preview', methods=['POST'])
+@api_endpoint()
 def preview_newsletter():
     """Generate newsletter preview."""
-    try:
-        data = request.json
-        session_id = request.headers.get('X-Session-Id', 'default')
-        
-        if session_id not in sessions:
-            return jsonify({'error': 'No session data found'}), 400
-        
-        session_data = sessions[session_id]
-        selected_banner = data.get('selected_banner', '')
-        
-        # Use selected content if available, otherwise use all scraped data
-        content_to_use = session_data.get('selected_content', session_data.get('scraped_data', []))
-        
-        # Build newsletter HTML
-        newsletter_html = newsletter_builder.build(
-            banner_url=selected_banner,
-            tagline=session_data.get('selected_tagline', ''),
-            introduction=session_data.get('selected_intro', ''),
-            content_items=content_to_use,
-            date_range=session_data['date_range']
-        )
-        
-        # Check for missing channels
-        missing_channels = newsletter_builder.get_missing_channels()
-        
-        session_data['newsletter_html'] = newsletter_html
-        session_data['selected_banner'] = selected_banner
-        session_data['missing_channels'] = missing_channels
-        
-        return jsonify({
-            'success': True,
-            'html': newsletter_html,
-            'missing_channels': missing_channels
-        })
-        
-    except Exception as e:
-        logger.error(f"Preview generation error: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+    data = request.json
+    session_id = request.headers.get('X-Session-Id', 'default')
+    
+    session_data = get_session(session_id)
+    
+    selected_banner = data.get('selected_banner', '')
+    
+    # Use selected content if available, otherwise use all scraped data
+    content_to_use = session_data.get('selected_content', session_data.get('scraped_data', []))
+    
+    # Build newsletter HTML
+    newsletter_html = get_newsletter_builder().build(
+        banner_url=selected_banner,
+        tagline=session_data.get('selected_tagline', ''),
+        introduction=session_data.get('selected_intro', ''),
+        content_items=content_to_use,
+        date_range=session_data['date_range']
+    )
+    
+    # Check for missing channels
+    missing_channels = get_newsletter_builder().get_missing_channels()
+    
+    session_store.update(session_id, {
+        'newsletter_html': newsletter_html,
+        'selected_banner': selected_banner,
+        'missing_channels': missing_channels
+    })
+    
+    return jsonify({
+        'success': True,
+        'html': newsletter_html,
+        'missing_channels': missing_channels
+    })
 
 @app.route('/api/add-channel-website', methods=['POST'])
+@api_endpoint()
 def add_channel_website():
     """Add website information for a missing channel."""
-    try:
-        data = request.json
-        channel = data.get('channel')
-        website = data.get('website')
-        country = data.get('country', 'US')
-        
-        if not channel or not website:
-            return jsonify({'error': 'Channel and website are required'}), 400
-        
-        # Add to database
-        success = newsletter_builder.add_channel_website(channel, website, country)
-        
-        if success:
-            logger.info(f"Added website '{website}' for channel '{channel}'")
-            return jsonify({
-                'success': True,
-                'message': f'Website added for {channel}'
-            })
-        else:
-            return jsonify({
-                'success': False,
-                'error': 'Failed to add channel website'
-            }), 500
-            
-    except Exception as e:
-        logger.error(f"Error adding channel website: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+    data = request.json
+    channel = data.get('channel')
+    website = data.get('website')
+    country = data.get('country', 'US')
+    
+    if not channel or not website:
+        return jsonify({'error': 'Channel and website are required'}), 400
+    
+    # Add to database
+    success = get_newsletter_builder().add_channel_website(channel, website, country)
+    
+    if success:
+        logger.info(f"Added website '{website}' for channel '{channel}'")
+        return jsonify({
+            'success': True,
+            'message': f'Website added for {channel}'
+        })
+    else:
+        return jsonify({
+            'success': False,
+            'error': 'Failed to add channel website'
+        }), 500
 
 @app.route('/api/download', methods=['GET', 'POST'])
+@api_endpoint('Download failed')
 def download_newsletter():
     """Download the generated newsletter as HTML file."""
-    try:
-        # Accept both GET and POST methods
-        session_id = request.headers.get('X-Session-Id', 'default')
-        
-        logger.info(f"Download request received for session: {session_id}")
-        logger.info(f"Current sessions: {list(sessions.keys())}")
-        
-        if session_id not in sessions:
-            logger.error(f"Session {session_id} not found in sessions")
-            return jsonify({
-                'error': 'No session data found. Please regenerate the newsletter preview.',
-                'details': 'Session may have expired. Try generating the preview again.'
-            }), 400
-        
-        session_data = sessions[session_id]
-        
-        if 'newsletter_html' not in session_data:
-            logger.error(f"Newsletter HTML not found in session {session_id}")
-            return jsonify({
-                'error': 'Newsletter not generated yet. Please complete the preview step first.',
-                'details': 'Click "Preview Newsletter" before downloading.'
-            }), 400
-        
-        # Save to temp file
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"newsletter_{timestamp}.html"
-        filepath = os.path.join(Config.TEMP_FOLDER, filename)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(session_data['newsletter_html'])
-        
-        logger.info(f"Newsletter saved to {filepath} for download")
-        
-        return send_file(
-            filepath,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='text/html'
-        )
-        
-    except Exception as e:
-        logger.error(f"Download error: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
-        return jsonify({'error': f'Download failed: {str(e)}'}), 500
+    # Accept both GET and POST methods
+    session_id = request.headers.get('X-Session-Id', 'default')
+    
+    logger.info(f"Download request received for session: {session_id}")
+    session_data = session_store.get(session_id)
+    
+    if session_data is None:
+        logger.error(f"Session {session_id} not found in sessions")
+        return jsonify({
+            'error': 'No session data found. Please regenerate the newsletter preview.',
+            'details': 'Session may have expired. Try generating the preview again.'
+        }), 400
+    
+    if 'newsletter_html' not in session_data:
+        logger.error(f"Newsletter HTML not found in session {session_id}")
+        return jsonify({
+            'error': 'Newsletter not generated yet. Please complete the preview step first.',
+            'details': 'Click "Preview Newsletter" before downloading.'
+        }), 400
+    
+    # Serve straight from memory - no temp file round-trip
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = f"newsletter_{timestamp}.html"
+    buffer = io.BytesIO(session_data['newsletter_html'].encode('utf-8'))
+    
+    logger.info(f"Sending newsletter {filename} for download")
+    
+    return send_file(
+        buffer,
+        as_attachment=True,
+        download_name=filename,
+        mimetype='text/html'
+    )
 
 @app.route('/health')
 def health_check():
     """Health check endpoint."""
-    return jsonify({
+    health = {
         'status': 'healthy',
         'timestamp': datetime.now().isoformat()
-    })
+    }
+    
+    session_count = session_store.local_count()
+    if session_count is not None:
+        health['sessions'] = session_count
+    
+    return jsonify(health)
 
 @app.errorhandler(404)
 def not_found(error):
@@ -414,4 +482,5 @@ def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
 
 if __name__ == '__main__':
-    app.run(debug=Config.DEBUG, port=5000)
\ No newline at end of file
+    # Development server; production runs under gunicorn (see gunicorn.conf.py)
+    app.run(debug=Config.DEBUG, port=5000, threaded=True)
\ No newline at end of file
@@ -20,10 +20,25 @@ class Config:
     HEADLESS_BROWSER = os.getenv('HEADLESS_BROWSER', 'true').lower() == 'true'
     TVINSIDER_BASE_URL = 'https://www.tvinsider.com/shows/calendar/'
     SCRAPE_METHOD = os.getenv('SCRAPE_METHOD', 'date_range')  # 'date_range' or 'full_page'
+    SCRAPE_CACHE_TIMEOUT = int(os.getenv('SCRAPE_CACHE_TIMEOUT', 3600))
     
     # Cache settings
-    CACHE_TYPE = os.getenv('CACHE_TYPE', 'simple')
+    CACHE_TYPE = os.getenv('CACHE_TYPE', 'RedisCache' if os.getenv('REDIS_URL') else 'SimpleCache')
+    CACHE_REDIS_URL = os.getenv('REDIS_URL')
     CACHE_DEFAULT_TIMEOUT = int(os.getenv('CACHE_DEFAULT_TIMEOUT', 900))
+    AI_CACHE_TIMEOUT = int(os.getenv('AI_CACHE_TIMEOUT', 86400))
+    
+    # Response compression
+    COMPRESS_MIMETYPES = ['application/json', 'text/html']
+    COMPRESS_ALGORITHM = ['br', 'gzip']
+    COMPRESS_LEVEL = 4
+    COMPRESS_BR_LEVEL = 4
+    
+    # Session storage
+    REDIS_URL = os.getenv('REDIS_URL')
+    REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', 32))
+    SESSION_TTL = int(os.getenv('SESSION_TTL', 3600))
+    SESSION_MAX = int(os.getenv('SESSION_MAX', 1000))  # In-process store only
     
     # Rate limiting
     OPENAI_RATE_LIMIT = int(os.getenv('OPENAI_RATE_LIMIT', 60))
@@ -40,6 +55,12 @@ class Config:
     BANNER_WIDTH = 1200
     BANNER_HEIGHT = 400
     IMAGE_QUALITY = 95
+    BANNER_JOB_TIMEOUT = int(os.getenv('BANNER_JOB_TIMEOUT', 300))
+    FLUX_MAX_CONCURRENCY = int(os.getenv('FLUX_MAX_CONCURRENCY', 4))
+    FLUX_POLL_TIMEOUT = int(os.getenv('FLUX_POLL_TIMEOUT', 120))
+    BANNER_TTL = int(os.getenv('BANNER_TTL', 86400))  # Keep at least SESSION_TTL
+    FLUX_CACHE_TTL = int(os.getenv('FLUX_CACHE_TTL', 604800))
+    FLUX_CACHE_MAX_ENTRIES = int(os.getenv('FLUX_CACHE_MAX_ENTRIES', 200))
     
     # File paths
     STATIC_FOLDER = 'static'
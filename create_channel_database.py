@@ -1,5 +1,6 @@
 import pandas as pd
 import os
+from modules.channel_db import save_channels
 
 # Channel data with website links
 channel_data = {
@@ -40,9 +41,9 @@ channel_data = {
 # Create DataFrame
 df = pd.DataFrame(channel_data)
 
-# Save to Excel file
+# Save to Excel file (plus a parquet copy for fast loading)
 excel_path = 'channel_database.xlsx'
-df.to_excel(excel_path, index=False, sheet_name='Channels')
+save_channels(df, excel_path)
 
 print(f"Channel database created successfully: {excel_path}")
 print(f"Total channels: {len(df)}")
@@ -0,0 +1,29 @@
+"""
+Gunicorn settings for production (run with: gunicorn app:app)
+"""
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+
+# Without Redis, sessions and banner jobs live in the worker's own memory, so
+# every request has to reach the same process
+_shared_state = bool(os.getenv('REDIS_URL'))
+workers = int(os.getenv('GUNICORN_WORKERS', 4 if _shared_state else 1))
+if workers > 1 and not _shared_state:
+    raise RuntimeError("GUNICORN_WORKERS > 1 requires REDIS_URL for shared sessions and jobs")
+
+# gevent workers monkey-patch the stdlib before the app is imported, so the
+# blocking requests/OpenAI/Redis calls in the services yield to other requests
+worker_class = 'gevent'
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 100))
+
+# Scrapes drive a real browser and can take a minute or more
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 180))
+graceful_timeout = 30
+
+accesslog = '-'
+errorlog = '-'
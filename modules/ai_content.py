@@ -1,27 +1,75 @@
+import json
 import logging
+import random
+import re
 import time
-import os
-from typing import List, Dict
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Dict, Optional
 from config import Config
+from utils.cache import RateLimiter
+import httpx
 import openai
 
 logger = logging.getLogger(__name__)
 
+# Leading numbering or bullets the model sometimes adds
+_NUM_BULLET_RE = re.compile(r'^[\d\.\-\*\•]+\s*')
+
+_FALLBACK_TAGLINES = (
+    "Your streaming spree for {month}",
+    "Catch up on this week's releases",
+    "Stream this week's best picks",
+    "Don't miss this week's premieres",
+    "Your weekly streaming guide"
+)
+
+_FALLBACK_INTROS = (
+    "Unlock endless entertainment! Stream the latest shows and movies from anywhere, ensuring you never miss out on global content. Click 'Watch Now' for seamless access!",
+    "Never miss out on the hottest releases this week! Stream anywhere and enjoy global content effortlessly. Click 'Watch Now' and dive into a world of entertainment.",
+    "Get ready for your weekly dose of entertainment! Access the latest releases from anywhere in the world. Click 'Watch Now' to start streaming!",
+    "Experience unlimited streaming! Access the newest shows and movies from any location and never be limited by geography. Click 'Watch Now' for instant entertainment!",
+    "Your gateway to global entertainment awaits! Stream the week's best releases from anywhere. Click 'Watch Now' and unlock a world of content!"
+)
+
 class AIContentGenerator:
     """Generate AI-powered content using OpenAI GPT."""
     
     def __init__(self, api_key):
         self.api_key = api_key
-        # Set API key as environment variable for OpenAI to use
+        self.model = "gpt-3.5-turbo"  # Using gpt-3.5-turbo for better availability
+        self.client = None
         if api_key:
-            os.environ['OPENAI_API_KEY'] = api_key
+            # One client per generator so the keep-alive pool is reused across requests
+            self.client = openai.OpenAI(
+                api_key=api_key,
+                max_retries=0,  # _generate_with_retry owns retries and backoff
+                http_client=httpx.Client(
+                    limits=httpx.Limits(max_keepalive_connections=20, max_connections=20, keepalive_expiry=30.0),
+                    timeout=httpx.Timeout(30.0, connect=5.0)
+                )
+            )
             logger.info("OpenAI API key configured")
         else:
             logger.warning("No OpenAI API key provided")
         
         self.rate_limit = Config.OPENAI_RATE_LIMIT
+        # Shared by taglines and intros; only blocks once the per-minute budget is spent
+        self.limiter = RateLimiter(max_calls=self.rate_limit, period=60)
         self.retry_attempts = Config.API_RETRY_ATTEMPTS
         self.retry_delay = Config.API_RETRY_DELAY
+    
+    def close(self):
+        """Close the pooled HTTP connections."""
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
         
     def generate_taglines(self, context: Dict, count: int = 3) -> List[str]:
         """Generate multiple tagline options."""
@@ -29,25 +77,21 @@ class AIContentGenerator:
         
         try:
             # Build context prompt
-            prompt = self._build_tagline_prompt(context)
+            prompt = self._build_tagline_prompt(context, count)
             
-            for i in range(count):
-                tagline = self._generate_with_retry(
-                    prompt=prompt,
-                    max_tokens=30,
-                    temperature=0.8 + (i * 0.1),  # Vary temperature for diversity
-                    is_tagline=True
-                )
-                
-                if tagline:
-                    # Clean and validate tagline
-                    tagline_clean = self._clean_tagline(tagline)
-                    if self._validate_tagline(tagline_clean):
-                        taglines.append(tagline_clean)
-                
-                # Rate limiting
-                if i < count - 1:  # Don't sleep after last iteration
-                    time.sleep(60 / self.rate_limit)
+            # One JSON response carries every candidate
+            candidates = self._generate_with_retry(
+                prompt=prompt,
+                max_tokens=30 * count + 20,
+                temperature=0.9,
+                is_tagline=True
+            )
+            
+            for tagline in candidates:
+                # Clean and validate tagline (the prompt already asks for valid length)
+                tagline_clean = self._clean_tagline(tagline)
+                if self._validate_tagline(tagline_clean):
+                    taglines.append(tagline_clean)
             
             # Ensure we have the requested number of taglines
             while len(taglines) < count:
@@ -65,24 +109,20 @@ class AIContentGenerator:
         
         try:
             # Build context prompt
-            prompt = self._build_intro_prompt(context)
+            prompt = self._build_intro_prompt(context, count)
             
-            for i in range(count):
-                intro = self._generate_with_retry(
-                    prompt=prompt,
-                    max_tokens=150,
-                    temperature=0.7 + (i * 0.1)  # Vary temperature for diversity
-                )
-                
-                if intro:
-                    # Clean and validate introduction
-                    intro_clean = self._clean_introduction(intro)
-                    if self._validate_introduction(intro_clean):
-                        intros.append(intro_clean)
-                
-                # Rate limiting
-                if i < count - 1:  # Don't sleep after last iteration
-                    time.sleep(60 / self.rate_limit)
+            # One JSON response carries every candidate
+            candidates = self._generate_with_retry(
+                prompt=prompt,
+                max_tokens=150 * count + 20,
+                temperature=0.8
+            )
+            
+            for intro in candidates:
+                # Clean and validate introduction (the prompt already asks for valid length)
+                intro_clean = self._clean_introduction(intro)
+                if self._validate_introduction(intro_clean):
+                    intros.append(intro_clean)
             
             # Ensure we have the requested number of intros
             while len(intros) < count:
@@ -94,11 +134,13 @@ class AIContentGenerator:
             logger.error(f"Error generating introductions: {str(e)}")
             return [self._get_fallback_intro() for _ in range(count)]
     
-    def _generate_with_retry(self, prompt: str, max_tokens: int, temperature: float, is_tagline: bool = False) -> str:
-        """Generate content with retry logic."""
-        if not self.api_key:
+    def _generate_with_retry(self, prompt: str, max_tokens: int, temperature: float,
+                             is_tagline: bool = False) -> List[str]:
+        """Generate a JSON list of options for one prompt with retry logic."""
+        key = 'taglines' if is_tagline else 'intros'
+        if self.client is None:
             logger.error("OpenAI API key not provided")
-            return ""
+            return []
             
         for attempt in range(self.retry_attempts):
             try:
@@ -108,43 +150,67 @@ class AIContentGenerator:
                 else:
                     system_prompt = "You are an expert copywriter specializing in concise, engaging marketing copy for streaming newsletters."
                 
-                # Make the API call using the openai module
-                response = openai.chat.completions.create(
-                    model="gpt-3.5-turbo",  # Using gpt-3.5-turbo for better availability
+                self.limiter.acquire()
+                response = self.client.chat.completions.create(
+                    model=self.model,
                     messages=[
                         {"role": "system", "content": system_prompt},
                         {"role": "user", "content": prompt}
                     ],
                     max_tokens=max_tokens,
                     temperature=temperature,
-                    n=1
+                    response_format={"type": "json_object"}
                 )
                 
                 if response and response.choices:
-                    content = response.choices[0].message.content.strip()
-                    logger.debug(f"Generated {'tagline' if is_tagline else 'intro'}: {content[:50]}...")
-                    return content
+                    data = json.loads(response.choices[0].message.content or '{}')
+                    items = data.get(key) if isinstance(data, dict) else None
+                    if not isinstance(items, list):
+                        raise ValueError(f"response JSON has no '{key}' list")
+                    contents = [item.strip() for item in items if isinstance(item, str) and item.strip()]
+                    logger.debug(f"Generated {len(contents)} {key}")
+                    return contents
                     
+            except ValueError as e:
+                # Malformed or truncated JSON; ask again
+                logger.warning(f"Invalid JSON from OpenAI (attempt {attempt + 1}): {str(e)}")
+            except openai.RateLimitError as e:
+                delay = (self._retry_after(e) or min(60, self.retry_delay * 2 ** attempt)) + random.uniform(0, 1)
+                logger.warning(f"Rate limit hit, waiting {delay:.1f} seconds")
+                # Applied through the limiter so concurrent callers back off too
+                self.limiter.defer(delay)
+            except (openai.AuthenticationError, openai.PermissionDeniedError):
+                logger.error("API key issue detected. Please check your OPENAI_API_KEY in .env file")
+                break  # Don't retry on API key issues
+            except openai.BadRequestError as e:
+                logger.error(f"OpenAI rejected the request: {str(e)}")
+                break  # Same request would fail again
+            except openai.APIConnectionError as e:
+                logger.warning(f"OpenAI connection error (attempt {attempt + 1}): {str(e)}")
+                if attempt < self.retry_attempts - 1:
+                    time.sleep(min(30, 2 ** attempt) + random.random())
             except Exception as e:
-                error_str = str(e)
-                if "rate_limit" in error_str.lower():
-                    logger.warning(f"Rate limit hit, waiting {self.retry_delay * (attempt + 1)} seconds")
-                    time.sleep(self.retry_delay * (attempt + 1))
-                elif "api" in error_str.lower() and "key" in error_str.lower():
-                    logger.error("API key issue detected. Please check your OPENAI_API_KEY in .env file")
-                    break  # Don't retry on API key issues
-                else:
-                    logger.error(f"OpenAI API error (attempt {attempt + 1}): {error_str}")
-                    time.sleep(self.retry_delay)
+                logger.error(f"OpenAI API error (attempt {attempt + 1}): {str(e)}")
+                if attempt < self.retry_attempts - 1:
+                    time.sleep(min(60, self.retry_delay * 2 ** attempt) + random.uniform(0, 1))
         
-        return ""
+        return []
     
-    def _build_tagline_prompt(self, context: Dict) -> str:
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        """Seconds to wait from a Retry-After header, if the server sent one."""
+        response = getattr(error, 'response', None)
+        value = response.headers.get('retry-after') if response is not None else None
+        try:
+            return float(value) if value else None
+        except ValueError:
+            return None  # HTTP-date form; fall back to exponential backoff
+    
+    def _build_tagline_prompt(self, context: Dict, count: int = 1) -> str:
         """Build prompt for tagline generation."""
         date_range = context.get('date_range', {})
         
         # Extract month from date range with error handling
-        from datetime import datetime
         try:
             start_date_str = date_range.get('start', '')
             if start_date_str:
@@ -157,11 +223,16 @@ class AIContentGenerator:
             logger.warning(f"Error parsing date for tagline: {e}")
             month = datetime.now().strftime('%B')
         
+        return self._tagline_prompt(month, tuple(context.get('highlights', [])[:3]), count)
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _tagline_prompt(month: str, highlights: tuple, count: int) -> str:
+        """Format the tagline prompt. Cached since the same week is usually asked for again."""
         # Include highlights if available
-        highlights = context.get('highlights', [])
         highlights_text = ""
         if highlights:
-            highlights_text = f"\nFeatured shows include: {', '.join(highlights[:3])}"
+            highlights_text = f"\nFeatured shows include: {', '.join(highlights)}"
         
         prompt = f"""Generate a short and engaging banner tagline for a streaming newsletter highlighting shows and movies for the upcoming week{highlights_text}. 
         
@@ -170,14 +241,19 @@ The tagline should be concise (maximum 4-5 words), exciting, and relevant to new
 2. Catch up on this week's releases.
 3. Stream this week's best picks.
 
-Generate exactly ONE tagline. Do not include numbering, quotes, or any explanation. Just the tagline text."""
+Generate exactly {count} different taglines. Return JSON: {{"taglines": [string, ...]}} with exactly {count} items, each 3-8 words. Do not include numbering or quotes inside the strings."""
         
         return prompt
     
-    def _build_intro_prompt(self, context: Dict) -> str:
+    def _build_intro_prompt(self, context: Dict, count: int = 1) -> str:
         """Build prompt for introduction generation."""
-        tagline = context.get('tagline', '')
-        
+        # The intro is deliberately generic, so only the count varies the prompt
+        return self._intro_prompt(count)
+    
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def _intro_prompt(count: int) -> str:
+        """Format the introduction prompt."""
         # Don't mention specific shows - keep it generic
         prompt = f"""Generate a short and engaging streaming newsletter body introduction in maximum of two lines (one small paragraph).
 
@@ -189,7 +265,7 @@ Use variations like:
 - "Get ready for your weekly dose of entertainment! Access the latest releases from anywhere in the world. Click 'Watch Now' to start streaming!"
 
 
-Generate exactly ONE body text that is generic and does NOT mention any specific show names. Do not include numbering, quotes, or any explanation. You may use one appropriate emoji if needed."""
+Generate exactly {count} different body texts that are generic and do NOT mention any specific show names. Return JSON: {{"intros": [string, ...]}} with exactly {count} items, each 15-50 words. Do not include numbering or quotes inside the strings. You may use one appropriate emoji per text if needed."""
         
         return prompt
     
@@ -199,8 +275,7 @@ Generate exactly ONE body text that is generic and does NOT mention any specific
         tagline = tagline.strip('"\'')
         
         # Remove any numbering or bullets
-        import re
-        tagline = re.sub(r'^[\d\.\-\*\•]+\s*', '', tagline)
+        tagline = _NUM_BULLET_RE.sub('', tagline)
         
         # Ensure proper capitalization
         if tagline and not tagline[0].isupper():
@@ -217,8 +292,7 @@ Generate exactly ONE body text that is generic and does NOT mention any specific
         intro = intro.strip('"\'')
         
         # Remove any numbering or bullets
-        import re
-        intro = re.sub(r'^[\d\.\-\*\•]+\s*', '', intro)
+        intro = _NUM_BULLET_RE.sub('', intro)
         
         # Ensure proper paragraph formatting
         intro = ' '.join(intro.split())
@@ -247,26 +321,8 @@ Generate exactly ONE body text that is generic and does NOT mention any specific
     
     def _get_fallback_tagline(self) -> str:
         """Get fallback tagline if generation fails."""
-        from datetime import datetime
-        month = datetime.now().strftime('%B')
-        fallbacks = [
-            f"Your streaming spree for {month}",
-            "Catch up on this week's releases",
-            "Stream this week's best picks",
-            "Don't miss this week's premieres",
-            "Your weekly streaming guide"
-        ]
-        import random
-        return random.choice(fallbacks)
+        return random.choice(_FALLBACK_TAGLINES).format(month=datetime.now().strftime('%B'))
     
     def _get_fallback_intro(self) -> str:
         """Get fallback introduction if generation fails."""
-        fallbacks = [
-            "Unlock endless entertainment! Stream the latest shows and movies from anywhere, ensuring you never miss out on global content. Click 'Watch Now' for seamless access!",
-            "Never miss out on the hottest releases this week! Stream anywhere and enjoy global content effortlessly. Click 'Watch Now' and dive into a world of entertainment.",
-            "Get ready for your weekly dose of entertainment! Access the latest releases from anywhere in the world. Click 'Watch Now' to start streaming!",
-            "Experience unlimited streaming! Access the newest shows and movies from any location and never be limited by geography. Click 'Watch Now' for instant entertainment!",
-            "Your gateway to global entertainment awaits! Stream the week's best releases from anywhere. Click 'Watch Now' and unlock a world of content!"
-        ]
-        import random
-        return random.choice(fallbacks)
\ No newline at end of file
+        return random.choice(_FALLBACK_INTROS)
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+Cached access to the channel database spreadsheet
+"""
+
+import logging
+import os
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DATABASE_PATH = 'channel_database.xlsx'
+SHEET_NAME = 'Channels'
+COLUMNS = ['Channel', 'Website', 'Country']
+
+
+def parquet_path(path: str = DATABASE_PATH) -> str:
+    """Path of the columnar copy that sits next to the Excel database."""
+    return f"{os.path.splitext(path)[0]}.parquet"
+
+
+def _write_parquet(df: pd.DataFrame, path: str) -> None:
+    """Atomically write the parquet copy of the Excel database at `path`."""
+    tmp_parquet = f"{os.path.splitext(path)[0]}.tmp.parquet"
+    df[COLUMNS].to_parquet(tmp_parquet, index=False, compression='zstd')
+    os.replace(tmp_parquet, parquet_path(path))
+
+
+def _source(path: str) -> Tuple[Optional[str], Optional[float]]:
+    """Pick the file to read: the parquet copy if it is up to date, else the Excel sheet."""
+    excel_mtime = os.path.getmtime(path) if os.path.exists(path) else None
+    
+    columnar_path = parquet_path(path)
+    if os.path.exists(columnar_path):
+        columnar_mtime = os.path.getmtime(columnar_path)
+        # A hand-edited spreadsheet is newer than its parquet copy and wins
+        if excel_mtime is None or columnar_mtime >= excel_mtime:
+            return columnar_path, columnar_mtime
+    
+    if excel_mtime is None:
+        return None, None
+    return path, excel_mtime
+
+
+@lru_cache(maxsize=8)
+def _read_channels(path: str, mtime: float) -> pd.DataFrame:
+    """Parse the channel table. Cached per (path, mtime) so edits are picked up."""
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_excel(path, sheet_name=SHEET_NAME)
+        # Refresh the parquet copy so the next process skips the Excel parse
+        try:
+            _write_parquet(df, path)
+        except Exception as e:
+            logger.warning(f"Could not write parquet copy of {path}: {str(e)}")
+    logger.info(f"Loaded {len(df)} channels from {path}")
+    return df
+
+
+@lru_cache(maxsize=8)
+def _build_index(path: str, mtime: float) -> Dict[str, Tuple[str, str, str]]:
+    """Build the lowercase channel name lookup for one version of the file."""
+    df = _read_channels(path, mtime)
+    return {
+        str(channel).strip().lower(): (channel, website, country)
+        for channel, website, country in zip(df['Channel'], df['Website'], df['Country'])
+    }
+
+
+def load_channels(path: str = DATABASE_PATH) -> pd.DataFrame:
+    """Get a copy of the channel table, re-parsing only when the file has changed."""
+    source, mtime = _source(path)
+    if source is None:
+        return pd.DataFrame(columns=COLUMNS)
+    return _read_channels(source, mtime).copy()
+
+
+def channel_index(path: str = DATABASE_PATH) -> Dict[str, Tuple[str, str, str]]:
+    """Get a read-only mapping of lowercase channel name -> (channel, website, country)."""
+    source, mtime = _source(path)
+    if source is None:
+        return {}
+    return _build_index(source, mtime)
+
+
+def save_channels(df: pd.DataFrame, path: str = DATABASE_PATH) -> None:
+    """Write the Excel sheet and its parquet copy atomically."""
+    root, ext = os.path.splitext(path)
+    
+    tmp_path = f"{root}.tmp{ext}"
+    df.to_excel(tmp_path, index=False, sheet_name=SHEET_NAME)
+    os.replace(tmp_path, path)
+    
+    # Written second so its mtime marks it as current
+    _write_parquet(df, path)
@@ -1,6 +1,8 @@
 import pandas as pd
 import os
+import atexit
 import logging
+from .channel_db import load_channels, save_channels
 
 logger = logging.getLogger(__name__)
 
@@ -11,12 +13,19 @@ class ChannelManager:
         """Initialize with channel database."""
         self.database_path = database_path
         self.channels_df = self._load_database()
+        # New channels wait here until the next save instead of copying the table per add
+        self._pending_rows = []
+        self._dirty = False
+        self._build_index()
+        # Unsaved additions are written once when the process exits
+        atexit.register(self.flush)
         
     def _load_database(self):
         """Load channel database from Excel file."""
         try:
             if os.path.exists(self.database_path):
-                df = pd.read_excel(self.database_path, sheet_name='Channels')
+                # Parsed once per file version and shared across managers
+                df = load_channels(self.database_path)
                 # Convert channel names to lowercase for case-insensitive matching
                 df['Channel_Lower'] = df['Channel'].str.lower()
                 logger.info(f"Loaded {len(df)} channels from database")
@@ -29,33 +38,66 @@ class ChannelManager:
             logger.error(f"Error loading channel database: {str(e)}")
             return pd.DataFrame(columns=['Channel', 'Website', 'Country', 'Channel_Lower'])
     
+    def _build_index(self):
+        """Map lowercase channel names to row positions for constant-time lookups."""
+        self._idx = {}
+        for i, channel_lower in enumerate(self.channels_df['Channel_Lower'].tolist()):
+            # First row wins, as with the old boolean-mask lookup
+            self._idx.setdefault(channel_lower, i)
+        # Lookups return these ready-made; the raw column is kept for saving
+        self._website = [self._canonical_url(w) for w in self.channels_df['Website'].tolist()]
+        self._display = self.channels_df['Channel'].tolist()
+        self._all_channels = None
+    
+    @staticmethod
+    def _canonical_url(website):
+        """Return the website with an https:// prefix, or None if it is missing."""
+        if not isinstance(website, str) or not website or website == 'N/A':
+            return None
+        # Ensure it has https:// prefix
+        if not website.startswith(('http://', 'https://')):
+            website = f"https://{website}"
+        return website
+    
+    def _merge_pending(self):
+        """Append buffered new channels to the DataFrame in one concat."""
+        if self._pending_rows:
+            self.channels_df = pd.concat(
+                [self.channels_df, pd.DataFrame(self._pending_rows)],
+                ignore_index=True
+            )
+            self._pending_rows.clear()
+    
     def _save_database(self):
         """Save updated channel database to Excel file."""
         try:
+            self._merge_pending()
             # Remove the temporary lowercase column before saving
             save_df = self.channels_df.drop(columns=['Channel_Lower'], errors='ignore')
-            save_df.to_excel(self.database_path, index=False, sheet_name='Channels')
+            save_channels(save_df, self.database_path)
+            self._dirty = False
             logger.info(f"Updated channel database saved to {self.database_path}")
         except Exception as e:
             logger.error(f"Error saving channel database: {str(e)}")
     
+    def flush(self):
+        """Write pending channel changes to disk, if there are any."""
+        if self._dirty:
+            self._save_database()
+    
     def get_channel_website(self, channel_name):
         """Get website URL for a channel."""
         # Clean and normalize channel name
         channel_clean = channel_name.strip().lower()
         
         # Only look for exact match - no partial matching to avoid wrong channels
-        match = self.channels_df[self.channels_df['Channel_Lower'] == channel_clean]
+        i = self._idx.get(channel_clean)
         
-        if not match.empty:
-            website = match.iloc[0]['Website']
-            channel_display = match.iloc[0]['Channel']
+        if i is not None:
+            website = self._website[i]
+            channel_display = self._display[i]
             
-            if website and website != 'N/A':
-                # Ensure it has https:// prefix
-                if not website.startswith(('http://', 'https://')):
-                    website = f"https://{website}"
-                
+            if website:
                 logger.debug(f"Using direct website URL for {channel_display}: {website}")
                 return website, None
             else:
@@ -66,29 +108,44 @@ class ChannelManager:
         logger.info(f"Channel '{channel_name}' not found in database - needs to be added")
         return None, channel_name
     
-    def add_channel_to_database(self, channel_name, website, country='US'):
-        """Add a new channel to the database."""
+    def get_channel_websites_bulk(self, channel_names):
+        """Look up several channels at once, returning {channel: (website, missing_channel)}."""
+        return {name: self.get_channel_website(name) for name in dict.fromkeys(channel_names)}
+    
+    def add_channel_to_database(self, channel_name, website, country='US', flush=False):
+        """Add a new channel to the database. Saved on `flush()` unless `flush` is True."""
         try:
             # Check if channel already exists
             channel_lower = channel_name.strip().lower()
-            if not self.channels_df[self.channels_df['Channel_Lower'] == channel_lower].empty:
+            i = self._idx.get(channel_lower)
+            if i is not None:
                 # Update existing channel
-                self.channels_df.loc[self.channels_df['Channel_Lower'] == channel_lower, 'Website'] = website
-                self.channels_df.loc[self.channels_df['Channel_Lower'] == channel_lower, 'Country'] = country
+                if i < len(self.channels_df):
+                    self.channels_df.iat[i, self.channels_df.columns.get_loc('Website')] = website
+                    self.channels_df.iat[i, self.channels_df.columns.get_loc('Country')] = country
+                else:
+                    pending = self._pending_rows[i - len(self.channels_df)]
+                    pending['Website'] = website
+                    pending['Country'] = country
+                self._website[i] = self._canonical_url(website)
                 logger.info(f"Updated channel '{channel_name}' with website '{website}'")
             else:
                 # Add new channel
-                new_row = pd.DataFrame({
-                    'Channel': [channel_name],
-                    'Website': [website],
-                    'Country': [country],
-                    'Channel_Lower': [channel_lower]
+                self._pending_rows.append({
+                    'Channel': channel_name,
+                    'Website': website,
+                    'Country': country,
+                    'Channel_Lower': channel_lower
                 })
-                self.channels_df = pd.concat([self.channels_df, new_row], ignore_index=True)
+                self._idx[channel_lower] = len(self.channels_df) + len(self._pending_rows) - 1
+                self._website.append(self._canonical_url(website))
+                self._display.append(channel_name)
+                self._all_channels = None
                 logger.info(f"Added new channel '{channel_name}' with website '{website}'")
             
-            # Save updated database
-            self._save_database()
+            self._dirty = True
+            if flush:
+                self._save_database()
             return True
             
         except Exception as e:
@@ -96,14 +153,18 @@ class ChannelManager:
             return False
     
     def get_all_channels(self):
-        """Get list of all channels in database."""
-        return self.channels_df['Channel'].tolist()
+        """Get all channel names in the database as a read-only tuple."""
+        # Built from the index lists, which already include pending rows
+        if self._all_channels is None:
+            self._all_channels = tuple(self._display)
+        return self._all_channels
     
     def search_channel(self, query):
         """Search for channels matching a query."""
+        self._merge_pending()
         query_lower = query.lower()
         matches = self.channels_df[
-            self.channels_df['Channel_Lower'].str.contains(query_lower, na=False)
+            self.channels_df['Channel_Lower'].str.contains(query_lower, na=False, regex=False)
         ]
         return matches['Channel'].tolist()
 
@@ -1,16 +1,24 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 import time
 import os
+import json
+import hashlib
 import base64
-import textwrap
 import urllib3
 import random
+import threading
+import uuid
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 from io import BytesIO
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, List, Dict, Tuple, Optional, Union
 from datetime import datetime
-from rembg import remove
+from rembg import new_session, remove
 from config import Config
 
 # Disable SSL warnings for corporate networks
@@ -18,9 +26,120 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 logger = logging.getLogger(__name__)
 
+def _non_transparent_bounds(image: Image.Image) -> Optional[Tuple[int, int]]:
+    """Detect the non-transparent region bounds in the image."""
+    if image.mode != 'RGBA':
+        return None
+    
+    # Columns that contain at least one non-transparent pixel
+    alpha = _as_rgba_array(image)[..., 3] > 0
+    columns = np.flatnonzero(alpha.any(axis=0))
+    
+    if columns.size:
+        return (int(columns[0]), int(columns[-1]))
+    return None
+
+@lru_cache(maxsize=4)
+def _load_background(path: str) -> Tuple[Image.Image, Optional[Tuple[int, int]]]:
+    """Decode a background template and scan its bounds once. Callers must copy before drawing."""
+    with Image.open(path) as bg:
+        bg = bg.convert('RGBA')
+    return bg, _non_transparent_bounds(bg)
+
+@lru_cache(maxsize=8)
+def _load_font(path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Parse a TrueType font once per path and size."""
+    return ImageFont.truetype(path, size)
+
+@lru_cache(maxsize=2)
+def _render_placeholder(width: int, height: int) -> Image.Image:
+    """Draw the placeholder used when Flux fails. Callers must copy before modifying."""
+    img = Image.new('RGB', (width, height), color=(100, 50, 150))
+    draw = ImageDraw.Draw(img)
+    
+    # Add some visual interest
+    for i in range(0, width, 50):
+        for j in range(0, height, 50):
+            color = (
+                100 + (i % 100),
+                50 + (j % 100),
+                150 + ((i + j) % 50)
+            )
+            draw.ellipse([i, j, i + 30, j + 30], fill=color)
+    
+    return img
+
+def _as_rgba_array(image: Image.Image) -> np.ndarray:
+    """Get a writable (height, width, 4) uint8 array of the image's RGBA pixels."""
+    if image.mode != 'RGBA':
+        image = image.convert('RGBA')
+    return np.array(image)
+
+def _from_rgba_array(pixels: np.ndarray) -> Image.Image:
+    """Wrap a (height, width, 4) uint8 array back into an RGBA image."""
+    return Image.fromarray(np.ascontiguousarray(pixels), 'RGBA')
+
+# Tagline fonts in order of preference: Helvetica Bold, Arial Bold, Arial
+_TAGLINE_FONTS = (
+    "static/fonts/HelveticaforTarget-Bold.ttf",
+    "C:/Windows/Fonts/arialbd.ttf",
+    "arial.ttf"
+)
+
+def _prune_files(directory: str, max_age: float, max_entries: Optional[int] = None,
+                 prefix: str = '') -> None:
+    """Delete files in `directory` older than `max_age` seconds, then the oldest beyond `max_entries`."""
+    try:
+        with os.scandir(directory) as it:
+            entries = sorted(
+                ((entry.stat().st_mtime, entry.path) for entry in it
+                 if entry.is_file() and entry.name.startswith(prefix)),
+                reverse=True
+            )
+    except OSError as e:
+        logger.warning(f"Could not scan {directory}: {str(e)}")
+        return
+    
+    cutoff = time.time() - max_age
+    for position, (mtime, path) in enumerate(entries):
+        if mtime < cutoff or (max_entries is not None and position >= max_entries):
+            try:
+                os.remove(path)
+            except OSError:
+                # Already removed by another worker
+                pass
+
+def _resolve_font(candidates: Tuple[str, ...], size: int) -> ImageFont.ImageFont:
+    """Load the first available font from `candidates`, else Pillow's default."""
+    for path in candidates:
+        try:
+            return _load_font(path, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
 class ImageGenerator:
     """Generate and compose banner images using AI."""
     
+    SHIRT_COLORS = ('yellow', 'green', 'black', 'blue', 'orange', 'red', 'pink')
+    GENDERS = ('man', 'woman')
+    # One activity per prompt
+    ACTIVITIES = (
+        "holding a bowl of popcorn",
+        "holding a bowl of nachos",
+        "holding a tv remote as if changing the channel"
+    )
+    
+    PROMPT_TEMPLATE = (
+        "A young {gender} sitting while watching something on TV, with an expression of joy. "
+        "Their body language conveys engagement, sitting straight and facing directly forward. "
+        "They are {activity}. Their posture reflects interest. "
+        "Clothing is casual, such as a t-shirt or a sweater in {shirt_color} color—avoiding white color. "
+        "There is only one person in the image, upper body visible above the waist, photographed against a pure white background (RGB 255,255,255) with absolutely no shadows, shading, gradients, or text. The background must be completely flat white with no visual distractions. "
+        "The subject should have smooth, straight, or slightly wavy hair with a neat and natural appearance, ensuring a well-groomed look. Their facial features should be clearly visible with a natural and relaxed expression. "
+        "All elements must be in sharp focus with high clarity, no motion blur, and distinct edges. The objects held should appear crisp, well-defined, and naturally integrated with the hands. Ensure a high level of detail in the textures of the objects, making them visually clear and easy to distinguish."
+    )
+    
     def __init__(self, api_key, api_url):
         self.api_key = api_key
         self.api_url = api_url
@@ -28,96 +147,104 @@ class ImageGenerator:
         self.banner_width = 600  # Original width
         self.banner_height = 350  # Original height
         self.image_quality = Config.IMAGE_QUALITY
+        self.max_concurrent_requests = Config.FLUX_MAX_CONCURRENCY
+        
+        # Resolved once; banner heights up to 350px use the smaller size
+        self._font_small = _resolve_font(_TAGLINE_FONTS, 28)
+        self._font_large = _resolve_font(_TAGLINE_FONTS, 30)
+        self._font_fallback = _resolve_font(("arial.ttf",), 36)
+        
+        # Keep-alive connections shared by submits, polls and downloads across threads
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Finished Flux images by request payload; identical prompt+seed is never paid for twice
+        # while the entry is fresh. Bounded by age and count, pruned after each write
+        self.cache_dir = os.path.join(Config.TEMP_FOLDER, 'flux_cache')
+        self.cache_ttl = Config.FLUX_CACHE_TTL
+        self.cache_max_entries = Config.FLUX_CACHE_MAX_ENTRIES
+        
+        # U2-Net model shared by every banner; loaded on first use
+        self._rembg_session = None
+        self._rembg_lock = threading.Lock()
         
     def generate_banners(self, tagline: str, theme_context: List[Dict]) -> List[str]:
         """Generate 6 banner variations (3 prompts x 2 images each)."""
-        banners = []
-        
+        # Unique per call so concurrent jobs on the same day never overwrite each other's files
+        batch_id = uuid.uuid4().hex[:12]
+        # Batches are never overwritten, so expired ones are cleared out here
+        self._prune_banners()
         try:
-            # Generate 3 different prompts based on context
+            # Generate 3 different prompts based on context, 2 images per prompt
             prompts = self._generate_image_prompts(theme_context)
+            jobs = [(prompt, variation) for prompt in prompts for variation in range(2)]
             
-            for prompt in prompts:
-                # Generate 2 images per prompt
-                for variation in range(2):
-                    logger.info(f"Generating image for prompt: {prompt[:50]}...")
-                    
-                    # Generate AI image
-                    ai_image = self._generate_ai_image(prompt, variation)
-                    
-                    if ai_image:
-                        # Compose banner with background and tagline
-                        banner_url = self._compose_banner(ai_image, tagline, len(banners))
-                        if banner_url:
-                            banners.append(banner_url)
-                    
-                    # Rate limiting
-                    time.sleep(2)
+            # The pool size caps in-flight Flux requests and concurrent composes
+            with ThreadPoolExecutor(max_workers=self.max_concurrent_requests) as executor:
+                # Phase 1: submit every job; cache hits and failures come back as images
+                submissions = list(executor.map(lambda job: self._submit_ai_image(*job), jobs))
+                
+                futures = {}
+                pending = {}
+                for index, ((prompt, _), submission) in enumerate(zip(jobs, submissions)):
+                    if isinstance(submission, Image.Image):
+                        futures[index] = executor.submit(self._compose_banner, submission, tagline, index, batch_id)
+                    else:
+                        pending[index] = submission
+                
+                # Phase 2: one loop polls all outstanding tasks; finished images are
+                # downloaded and composed on the pool while the rest keep polling
+                def on_ready(index: int, image_url: str, cache_path: str) -> None:
+                    futures[index] = executor.submit(
+                        self._download_and_compose, image_url, cache_path, jobs[index][0], tagline, index, batch_id
+                    )
+                
+                for index in self._poll_ai_images(pending, on_ready):
+                    placeholder = self._generate_placeholder_image(jobs[index][0])
+                    futures[index] = executor.submit(self._compose_banner, placeholder, tagline, index, batch_id)
+                
+                banners = [url for url in (futures[i].result() for i in sorted(futures)) if url]
             
             # Ensure we have 6 banners (use fallbacks if needed)
             while len(banners) < 6:
-                banners.append(self._get_fallback_banner(tagline, len(banners)))
+                banners.append(self._get_fallback_banner(tagline, len(banners), batch_id))
             
             return banners[:6]
             
         except Exception as e:
             logger.error(f"Error generating banners: {str(e)}")
-            return [self._get_fallback_banner(tagline, i) for i in range(6)]
+            return [self._get_fallback_banner(tagline, i, batch_id) for i in range(6)]
     
     def _generate_image_prompts(self, theme_context: List[Dict]) -> List[str]:
         """Generate diverse image prompts based on content with random gender and shirt colors."""
-        # Define color array
-        shirt_colors = ['yellow', 'green', 'black', 'blue', 'orange', 'red', 'pink']
+        count = len(self.ACTIVITIES)
+        genders = random.choices(self.GENDERS, k=count)
+        shirt_colors = random.choices(self.SHIRT_COLORS, k=count)
         
-        # Define gender options
-        genders = ['man', 'woman']
-        
-        # Define snack/activity variations
-        activities = [
-            "holding a bowl of popcorn",
-            "holding a bowl of nachos", 
-            "holding a tv remote as if changing the channel"
-        ]
-        
-        # Generate 3 prompts with different random combinations
         enhanced_prompts = []
-        for i in range(3):
-            # Randomly select gender and color for each prompt
-            gender = random.choice(genders)
-            shirt_color = random.choice(shirt_colors)
-            activity = activities[i]  # Use different activity for each prompt
-            
-            # Build the base prompt with random selections
-            base_prompt = (
-                f"A young {gender} sitting while watching something on TV, with an expression of joy. "
-                f"Their body language conveys engagement, sitting straight and facing directly forward. "
-                f"They are {activity}. Their posture reflects interest. "
-                f"Clothing is casual, such as a t-shirt or a sweater in {shirt_color} color—avoiding white color."
-            )
-            
-            # Add background and quality specifications
-            enhanced_prompt = (
-                f"{base_prompt} "
-                "There is only one person in the image, upper body visible above the waist, photographed against a pure white background (RGB 255,255,255) with absolutely no shadows, shading, gradients, or text. The background must be completely flat white with no visual distractions. "
-                "The subject should have smooth, straight, or slightly wavy hair with a neat and natural appearance, ensuring a well-groomed look. Their facial features should be clearly visible with a natural and relaxed expression. "
-                "All elements must be in sharp focus with high clarity, no motion blur, and distinct edges. The objects held should appear crisp, well-defined, and naturally integrated with the hands. Ensure a high level of detail in the textures of the objects, making them visually clear and easy to distinguish."
+        for i, (gender, shirt_color, activity) in enumerate(zip(genders, shirt_colors, self.ACTIVITIES)):
+            enhanced_prompts.append(
+                self.PROMPT_TEMPLATE.format(gender=gender, activity=activity, shirt_color=shirt_color)
             )
             
-            enhanced_prompts.append(enhanced_prompt)
-            
             # Log the random selections for debugging
             logger.info(f"Prompt {i+1}: Gender={gender}, Shirt Color={shirt_color}, Activity={activity}")
         
         return enhanced_prompts
     
-    def _generate_ai_image(self, prompt: str, variation: int) -> Image.Image:
-        """Generate AI image using Flux API with polling."""
+    def _submit_ai_image(self, prompt: str, variation: int) -> Union[Image.Image, Tuple[str, str]]:
+        """Submit a Flux job. Returns (polling_url, cache_path), or an image for a cache hit or failure."""
         try:
             if not self.api_key or not self.api_url:
                 logger.warning("Flux API credentials not configured")
                 return self._generate_placeholder_image(prompt)
             
-            # Step 1: Submit generation request to Flux API
             headers = {
                 'X-Key': self.api_key,
                 'Content-Type': 'application/json'
@@ -134,9 +261,16 @@ class ImageGenerator:
                 'output_format': 'png'
             }
             
-            logger.info(f"Submitting prompt to Flux API: {prompt[:50]}...")
+            cache_key = hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+            cache_path = os.path.join(self.cache_dir, f"{cache_key}.png")
+            if self._is_cache_fresh(cache_path):
+                logger.info(f"Using cached Flux image (variation {variation})")
+                with Image.open(cache_path) as cached:
+                    return cached.copy()
+            
+            logger.info(f"Submitting prompt to Flux API (variation {variation}): {prompt[:50]}...")
             
-            response = requests.post(
+            response = self.session.post(
                 self.api_url,
                 headers=headers,
                 json=payload,
@@ -149,92 +283,133 @@ class ImageGenerator:
                 return self._generate_placeholder_image(prompt)
             
             result = response.json()
-            task_id = result.get('id')
             polling_url = result.get('polling_url')
             
             if not polling_url:
                 logger.error("No polling URL received from Flux API")
                 return self._generate_placeholder_image(prompt)
             
-            logger.info(f"Flux task ID: {task_id}, polling for result...")
-            
-            # Step 2: Poll for result
-            max_attempts = 30
-            for attempt in range(max_attempts):
-                time.sleep(2)  # Wait between polls
-                
-                poll_response = requests.get(
-                    polling_url,
-                    headers={'X-Key': self.api_key},
-                    verify=False
-                )
-                
-                if poll_response.status_code == 200:
-                    poll_data = poll_response.json()
-                    status = poll_data.get('status')
-                    
-                    if status == 'Ready':
-                        # Image is ready
-                        image_url = poll_data.get('result', {}).get('sample')
-                        if image_url:
-                            logger.info("Flux image ready, downloading...")
-                            
-                            # Download image
-                            img_response = requests.get(image_url, verify=False)
-                            if img_response.status_code == 200:
-                                return Image.open(BytesIO(img_response.content))
-                            else:
-                                logger.error(f"Failed to download Flux image: {img_response.status_code}")
-                        break
-                    elif status == 'Error':
-                        logger.error(f"Flux generation error: {poll_data.get('error', 'Unknown')}")
-                        break
-                    # Continue polling if status is 'Pending' or other
-            
-            logger.warning("Flux API timeout or error, using placeholder")
-            return self._generate_placeholder_image(prompt)
+            logger.info(f"Flux task ID: {result.get('id')}, queued for polling")
+            return polling_url, cache_path
             
         except Exception as e:
-            logger.error(f"Error generating AI image: {str(e)}")
+            logger.error(f"Error submitting AI image: {str(e)}")
             return self._generate_placeholder_image(prompt)
     
-    def _get_non_transparent_bounds(self, image: Image.Image) -> Optional[Tuple[int, int]]:
-        """Detect the non-transparent region bounds in the image."""
-        if image.mode != 'RGBA':
-            return None
-        
-        width, height = image.size
-        pixels = image.load()
+    def _poll_ai_images(self, pending: Dict[int, Tuple[str, str]],
+                        on_ready: Callable[[int, str, str], None]) -> List[int]:
+        """Poll all queued Flux tasks in one loop, calling on_ready as each finishes. Returns failed indices."""
+        failed = []
         
-        # Find leftmost and rightmost non-transparent pixels
-        min_x = width
-        max_x = 0
+        # Quick at first, backing off for slow jobs
+        delay = 0.5
+        deadline = time.monotonic() + Config.FLUX_POLL_TIMEOUT
+        while pending and time.monotonic() < deadline:
+            time.sleep(delay)
+            delay = min(delay * 1.5, 4.0)
+            
+            for index, (polling_url, cache_path) in list(pending.items()):
+                try:
+                    poll_response = self.session.get(
+                        polling_url,
+                        headers={'X-Key': self.api_key},
+                        timeout=30,
+                        verify=False
+                    )
+                    if poll_response.status_code != 200:
+                        continue
+                    poll_data = poll_response.json()
+                except Exception as e:
+                    logger.warning(f"Flux poll failed, will retry: {str(e)}")
+                    continue
+                
+                status = poll_data.get('status')
+                if status == 'Ready':
+                    del pending[index]
+                    image_url = poll_data.get('result', {}).get('sample')
+                    if image_url:
+                        logger.info("Flux image ready, downloading...")
+                        on_ready(index, image_url, cache_path)
+                    else:
+                        failed.append(index)
+                elif status == 'Error':
+                    logger.error(f"Flux generation error: {poll_data.get('error', 'Unknown')}")
+                    del pending[index]
+                    failed.append(index)
+                # Continue polling if status is 'Pending' or other
         
-        for x in range(width):
-            for y in range(height):
-                if pixels[x, y][3] > 0:  # Check alpha channel
-                    min_x = min(min_x, x)
-                    max_x = max(max_x, x)
+        if pending:
+            logger.warning(f"Flux API timeout for {len(pending)} images, using placeholders")
+            failed.extend(pending)
+        return failed
+    
+    def _download_and_compose(self, image_url: str, cache_path: str, prompt: str,
+                              tagline: str, index: int, batch_id: str) -> str:
+        """Download a finished Flux image and compose it into a banner."""
+        ai_image = None
+        try:
+            img_response = self.session.get(image_url, timeout=60, verify=False)
+            if img_response.status_code == 200:
+                self._store_cached_image(cache_path, img_response.content)
+                ai_image = Image.open(BytesIO(img_response.content))
+            else:
+                logger.error(f"Failed to download Flux image: {img_response.status_code}")
+        except Exception as e:
+            logger.error(f"Error downloading AI image: {str(e)}")
         
-        if min_x < width and max_x > 0:
-            return (min_x, max_x)
-        return None
+        if ai_image is None:
+            ai_image = self._generate_placeholder_image(prompt)
+        return self._compose_banner(ai_image, tagline, index, batch_id)
     
-    def _compose_banner(self, ai_image: Image.Image, tagline: str, index: int) -> str:
+    def _store_cached_image(self, cache_path: str, content: bytes) -> None:
+        """Write downloaded image bytes to the Flux cache atomically."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not cache Flux image: {str(e)}")
+            return
+        self._prune_image_cache()
+    
+    def _is_cache_fresh(self, cache_path: str) -> bool:
+        """Whether a cached Flux image exists and is younger than the cache TTL."""
+        try:
+            return time.time() - os.path.getmtime(cache_path) < self.cache_ttl
+        except OSError:
+            return False
+    
+    def _prune_banners(self) -> None:
+        """Delete generated and fallback banners that have outlived BANNER_TTL."""
+        _prune_files(os.path.join(Config.STATIC_FOLDER, "banners"), Config.BANNER_TTL, prefix="Banner_")
+        _prune_files(Config.TEMP_FOLDER, Config.BANNER_TTL, prefix="fallback_banner_")
+    
+    def _prune_image_cache(self) -> None:
+        """Remove expired Flux images, then the oldest ones beyond the entry limit."""
+        _prune_files(self.cache_dir, self.cache_ttl, self.cache_max_entries)
+    
+    def _get_rembg_session(self):
+        """Load the background-removal model once and reuse it across banners."""
+        if self._rembg_session is None:
+            with self._rembg_lock:
+                if self._rembg_session is None:
+                    self._rembg_session = new_session('u2net')
+        return self._rembg_session
+    
+    def _compose_banner(self, ai_image: Image.Image, tagline: str, index: int, batch_id: str) -> str:
         """Compose final banner with background, AI image, and tagline using reference method."""
         try:
-            # Load the background image (ensure RGBA for transparency)
-            background = self._get_background_template(index)
-            if not background:
-                background = self._create_gradient_background(index)
+            # Load the background image (ensure RGBA for transparency) and
+            # the area where it is non-transparent
+            background, non_transparent_bounds = self._get_background_template(index)
             
             if background.mode != 'RGBA':
                 background = background.convert('RGBA')
             
             width, height = background.size
             
-            # Detect the area where background is non-transparent
-            non_transparent_bounds = self._get_non_transparent_bounds(background)
             if non_transparent_bounds:
                 min_x, max_x = non_transparent_bounds
             else:
@@ -244,39 +419,30 @@ class ImageGenerator:
             if ai_image.mode != 'RGBA':
                 ai_image = ai_image.convert('RGBA')
             
-            # Apply rembg with optimized settings for white background removal
-            # Using alpha matting for better edge quality on white backgrounds
-            foreground = remove(
-                ai_image,
-                alpha_matting=True,
-                alpha_matting_foreground_threshold=240,
-                alpha_matting_background_threshold=10,
-                alpha_matting_erode_size=10
-            )
-            
-            # Additional cleanup: ensure pure white pixels are transparent
-            # This helps with any remaining white background artifacts
-            fg_data = foreground.getdata()
-            new_data = []
-            for item in fg_data:
-                # Change all white (and near-white) pixels to transparent
-                if item[0] > 250 and item[1] > 250 and item[2] > 250:
-                    new_data.append((255, 255, 255, 0))  # Make transparent
-                else:
-                    new_data.append(item)
-            foreground.putdata(new_data)
-            
             # Calculate optimal size for the Flux image
             # Make the image bigger - about 55% of the banner width
-            fg_width, fg_height = foreground.size
+            fg_width, fg_height = ai_image.size
             max_fg_width = int(width * 0.55)  # Increased from 50% to 55%
             max_fg_height = int(height * 0.95)  # Increased from 90% to 95%
             
-            # Scale to fit within these constraints while maintaining aspect ratio
+            # Scale to fit within these constraints while maintaining aspect ratio.
+            # Done before rembg so segmentation and cleanup touch only the final pixels
             scale_factor = min(max_fg_width / fg_width, max_fg_height / fg_height)
             new_width = int(fg_width * scale_factor)
             new_height = int(fg_height * scale_factor)
-            foreground = foreground.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            ai_image = ai_image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            
+            # Plain segmentation is enough: the prompt asks for a flat white
+            # background and the near-white pass below cleans up the edges
+            foreground = remove(ai_image, session=self._get_rembg_session())
+            
+            # Additional cleanup: ensure pure white pixels are transparent
+            # This helps with any remaining white background artifacts
+            fg = _as_rgba_array(foreground)
+            # Change all white (and near-white) pixels to transparent
+            near_white = (fg[..., :3] > 250).all(axis=2)
+            fg[near_white] = (255, 255, 255, 0)
+            foreground = _from_rgba_array(fg)
             
             # Position on the right side of the banner, slightly lower
             fg_x = width - new_width - 15  # Reduced margin to 15px from right edge
@@ -288,20 +454,7 @@ class ImageGenerator:
             # Add text on the left side
             draw = ImageDraw.Draw(background)
             
-            # Try to load custom font, fallback to Arial or default
-            try:
-                # First try Helvetica Bold if available
-                font_path = "C:/Windows/Fonts/arialbd.ttf"  # Arial Bold
-                if os.path.exists("static/fonts/HelveticaforTarget-Bold.ttf"):
-                    font_path = "static/fonts/HelveticaforTarget-Bold.ttf"
-                # Decreased font size for better fit
-                font_size = 28 if height <= 350 else 30
-                font = ImageFont.truetype(font_path, font_size)
-            except:
-                try:
-                    font = ImageFont.truetype("arial.ttf", 28)
-                except:
-                    font = ImageFont.load_default()
+            font = self._font_small if height <= 350 else self._font_large
             
             # Position text more to the right, with better wrapping
             # Calculate available space before the Flux image
@@ -309,56 +462,24 @@ class ImageGenerator:
             text_x = 80  # Moved from 60 to 80 (further to the right)
             text_y = int(height / 2) - 50  # Adjusted vertical position
             
-            # Calculate max characters per line based on available space
-            # This prevents text from colliding with the Flux image
-            max_chars_per_line = 13  # Adjusted for new spacing
-            
-            # Wrap text smartly - prefer 2-3 lines for better readability
-            # Use break_long_words=False to prevent word splitting
-            words = tagline.split()
-            if len(tagline) > 20:  # For longer taglines
-                max_chars_per_line = 10  # Use shorter lines for longer text
-            
-            # Use textwrap with break_long_words=False to prevent word splitting
-            wrapped_lines = textwrap.wrap(
-                tagline, 
-                width=max_chars_per_line,
-                break_long_words=False,  # Never split words across lines
-                break_on_hyphens=False   # Don't break on hyphens either
-            )
-            
-            # If any line is still too long because of a long word, adjust wrapping
-            # This ensures words like "entertainment" stay on one line
-            final_lines = []
-            for line in wrapped_lines:
-                # Check if any word in the line is being cut
-                if len(line) > max_chars_per_line and ' ' not in line:
-                    # Single long word - keep it on its own line
-                    final_lines.append(line)
-                else:
-                    final_lines.append(line)
-            
-            wrapped_text = "\n".join(final_lines)
+            # Wrap by rendered width so text never collides with the Flux image
+            wrapped_text = "\n".join(self._wrap_to_width(tagline, font, available_width))
             
-            # Draw text with transparency support
-            text_layer = Image.new("RGBA", background.size, (255, 255, 255, 0))  # Transparent text layer
-            text_draw = ImageDraw.Draw(text_layer)
-            text_draw.text((text_x, text_y), wrapped_text, font=font, fill=(255, 255, 255, 255))
-            
-            # Merge text layer with background
-            final_banner = Image.alpha_composite(background, text_layer)
+            # Opaque white text needs no separate layer; draw it straight onto the banner
+            draw.text((text_x, text_y), wrapped_text, font=font, fill=(255, 255, 255, 255))
+            final_banner = background
             
             # Set output directory
             banner_dir = os.path.join(Config.STATIC_FOLDER, "banners")
             os.makedirs(banner_dir, exist_ok=True)
             
-            # Generate filename using current date and index
+            # Generate filename using current date, batch and index
             current_date = datetime.now().strftime("%d_%B_%Y")
-            filename = f"Banner_{current_date}_{index}.png"
+            filename = f"Banner_{current_date}_{batch_id}_{index}.png"
             filepath = os.path.join(banner_dir, filename)
             
-            # Save banner
-            final_banner.save(filepath, 'PNG')
+            # Save banner; fast zlib level, the file is only a few hundred KB either way
+            final_banner.save(filepath, 'PNG', compress_level=1)
             
             # Return URL path
             return f"/static/banners/{filename}"
@@ -367,29 +488,41 @@ class ImageGenerator:
             logger.error(f"Error composing banner: {str(e)}")
             return ""
     
-    def _get_background_template(self, index: int) -> Image.Image:
-        """Load or create background template."""
+    @staticmethod
+    def _wrap_to_width(text: str, font: ImageFont.ImageFont, max_width: int) -> List[str]:
+        """Greedily fill lines up to `max_width` pixels; over-long words get their own line."""
+        lines = []
+        current = ''
+        for word in text.split():
+            candidate = f"{current} {word}" if current else word
+            if current and font.getlength(candidate) > max_width:
+                lines.append(current)
+                current = word
+            else:
+                current = candidate
+        if current:
+            lines.append(current)
+        return lines
+    
+    def _get_background_template(self, index: int) -> Tuple[Image.Image, Optional[Tuple[int, int]]]:
+        """Load or create background template, with its non-transparent column bounds."""
         try:
             # Always use the same background image (banner_bg_0) without resizing
             template_path = os.path.join(Config.ASSETS_FOLDER, 'backgrounds', 'banner_bg_0.png')
             if os.path.exists(template_path):
-                bg = Image.open(template_path)
+                bg, bounds = _load_background(template_path)
                 # Update dimensions to match actual background
                 self.banner_width, self.banner_height = bg.size
-                return bg
-            
-            # Create gradient background if template doesn't exist
-            return self._create_gradient_background(index)
+                return bg.copy(), bounds
             
         except Exception as e:
             logger.error(f"Error loading background: {str(e)}")
-            return self._create_gradient_background(index)
+        
+        # Create gradient background if template doesn't exist; it is opaque edge to edge
+        return self._create_gradient_background(index), (0, self.banner_width - 1)
     
     def _create_gradient_background(self, index: int) -> Image.Image:
         """Create a gradient background."""
-        img = Image.new('RGB', (self.banner_width, self.banner_height))
-        draw = ImageDraw.Draw(img)
-        
         # Define gradient colors (purple theme)
         color_sets = [
             ((59, 16, 142), (139, 69, 185)),  # Purple gradient
@@ -399,16 +532,12 @@ class ImageGenerator:
         
         start_color, end_color = color_sets[index % 3]
         
-        # Create gradient
-        for i in range(self.banner_width):
-            ratio = i / self.banner_width
-            r = int(start_color[0] * (1 - ratio) + end_color[0] * ratio)
-            g = int(start_color[1] * (1 - ratio) + end_color[1] * ratio)
-            b = int(start_color[2] * (1 - ratio) + end_color[2] * ratio)
-            
-            draw.rectangle([(i, 0), (i + 1, self.banner_height)], fill=(r, g, b))
+        # Create gradient: one interpolated row, repeated down the image
+        ratios = (np.arange(self.banner_width, dtype=np.float32) / self.banner_width)[:, None]
+        row = np.array(start_color, dtype=np.float32) * (1 - ratios) + np.array(end_color, dtype=np.float32) * ratios
+        gradient = np.broadcast_to(row.astype(np.uint8), (self.banner_height, self.banner_width, 3))
         
-        return img
+        return Image.fromarray(np.ascontiguousarray(gradient), 'RGB')
     
     def _apply_gradient_fade(self, image: Image.Image) -> Image.Image:
         """Apply gradient fade to image edges."""
@@ -416,40 +545,25 @@ class ImageGenerator:
         if image.mode != 'RGBA':
             image = image.convert('RGBA')
         
-        # Create alpha mask
-        alpha = Image.new('L', image.size, 255)
-        draw = ImageDraw.Draw(alpha)
-        
-        # Apply gradient fade on left edge
+        # Create alpha mask with a gradient fade on the left edge
         fade_width = 100
-        for i in range(fade_width):
-            opacity = int(255 * (i / fade_width))
-            draw.rectangle([(i, 0), (i + 1, image.height)], fill=opacity)
+        row = np.full(image.width, 255, dtype=np.uint8)
+        fade = min(fade_width, image.width)
+        row[:fade] = (255 * np.arange(fade) / fade_width).astype(np.uint8)
+        alpha = np.broadcast_to(row, (image.height, image.width))
         
         # Apply the alpha mask
-        image.putalpha(alpha)
+        image.putalpha(Image.fromarray(np.ascontiguousarray(alpha), 'L'))
         
         return image
     
     
     def _generate_placeholder_image(self, prompt: str) -> Image.Image:
         """Generate a placeholder image when API fails."""
-        img = Image.new('RGB', (self.banner_width, self.banner_height), color=(100, 50, 150))
-        draw = ImageDraw.Draw(img)
-        
-        # Add some visual interest
-        for i in range(0, self.banner_width, 50):
-            for j in range(0, self.banner_height, 50):
-                color = (
-                    100 + (i % 100),
-                    50 + (j % 100),
-                    150 + ((i + j) % 50)
-                )
-                draw.ellipse([i, j, i + 30, j + 30], fill=color)
-        
-        return img
+        # Deterministic for a given size, so it is drawn once and copied
+        return _render_placeholder(self.banner_width, self.banner_height).copy()
     
-    def _get_fallback_banner(self, tagline: str, index: int) -> str:
+    def _get_fallback_banner(self, tagline: str, index: int, batch_id: str) -> str:
         """Generate a fallback banner when API fails."""
         try:
             # Create simple gradient banner
@@ -457,10 +571,7 @@ class ImageGenerator:
             
             # Add tagline
             draw = ImageDraw.Draw(banner)
-            try:
-                font = ImageFont.truetype("arial.ttf", 36)
-            except:
-                font = ImageFont.load_default()
+            font = self._font_fallback
             
             # Draw centered text
             draw.text(
@@ -471,9 +582,9 @@ class ImageGenerator:
             )
             
             # Save
-            filename = f"fallback_banner_{index}.png"
+            filename = f"fallback_banner_{batch_id}_{index}.png"
             filepath = os.path.join(Config.TEMP_FOLDER, filename)
-            banner.save(filepath, 'PNG', quality=self.image_quality)
+            banner.save(filepath, 'PNG', compress_level=1)
             
             return f"/static/temp/{filename}"
             
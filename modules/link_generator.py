@@ -1,10 +1,100 @@
 import re
+from functools import lru_cache
 from urllib.parse import quote
 from slugify import slugify
 import logging
 
 logger = logging.getLogger(__name__)
 
+_SCHEME_RE = re.compile(r'^https?://')
+_WWW_RE = re.compile(r'^www\.')
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s-]')
+_SEPARATORS_RE = re.compile(r'[-\s]+')
+
+# Streaming service domains, matched against the host and its parent domains
+_DOMAIN_MAPPINGS = {
+    'hbomax.com': 'max.com',
+    'disneyplus.com': 'disneyplus.com',
+    'netflix.com': 'netflix.com',
+    'hulu.com': 'hulu.com',
+    'primevideo.com': 'primevideo.com',
+    'peacocktv.com': 'peacocktv.com',
+    'paramountplus.com': 'paramountplus.com',
+    'tv.apple.com': 'tv.apple.com',
+    'plus.espn.com': 'plus.espn.com',
+    'servustv.com': 'servustv.com'
+}
+
+_CHANNEL_MAPPINGS = {
+    'hbo-max': 'HBO Max',
+    'disney-plus': 'Disney+',
+    'disney': 'Disney',
+    'netflix': 'Netflix',
+    'hulu': 'Hulu',
+    'amazon-prime': 'Prime Video',
+    'prime-video': 'Prime Video',
+    'peacock': 'Peacock',
+    'paramount-plus': 'Paramount+',
+    'paramount': 'Paramount',
+    'apple-tv': 'Apple TV',
+    'espn': 'ESPN',
+    'espn-plus': 'ESPN+',
+    'showtime': 'Showtime',
+    'starz': 'Starz',
+    'amc': 'AMC',
+    'amc-plus': 'AMC+',
+    'discovery': 'Discovery',
+    'discovery-plus': 'Discovery+',
+    'servustv': 'ServusTV',
+    'bbc': 'BBC',
+    'fox': 'FOX',
+    'nbc': 'NBC',
+    'abc': 'ABC',
+    'cbs': 'CBS'
+}
+
+
+# Pure functions of their input, so repeat services across items are free
+@lru_cache(maxsize=1024)
+def _normalize_website_url(website):
+    """Normalize and clean website URL."""
+    if not website:
+        return "#"
+    
+    # Clean and extract domain from website URL, removing scheme and www
+    website_clean = _WWW_RE.sub('', _SCHEME_RE.sub('', website))
+    
+    # Remove path and query parameters
+    website_clean = website_clean.split('/', 1)[0]
+    website_clean = website_clean.split('?', 1)[0]
+    
+    # Handle specific streaming service domains, including their subdomains
+    labels = website_clean.split('.')
+    for i in range(len(labels) - 1):
+        replacement = _DOMAIN_MAPPINGS.get('.'.join(labels[i:]))
+        if replacement:
+            return f"https://{replacement}"
+    
+    return f"https://{website_clean}"
+
+
+@lru_cache(maxsize=1024)
+def _normalize_channel_name(channel):
+    """Normalize channel name for consistent formatting."""
+    if not channel:
+        return "unknown"
+    
+    # Remove special characters and spaces
+    channel_clean = _SPECIAL_CHARS_RE.sub('', channel)
+    channel_clean = _SEPARATORS_RE.sub('-', channel_clean)
+    
+    # Convert to slug format
+    channel_slug = slugify(channel_clean)
+    
+    # Return mapped channel or original
+    return _CHANNEL_MAPPINGS.get(channel_slug, channel)
+
+
 class LinkGenerator:
     """Generate clean URLs for streaming services."""
     
@@ -13,87 +103,16 @@ class LinkGenerator:
     
     def normalize_website_url(self, website):
         """Normalize and clean website URL."""
-        if not website:
-            return "#"
-        
-        # Clean and extract domain from website URL
-        website_clean = re.sub(r'^https?://', '', website)
-        
-        # Remove www
-        website_clean = re.sub(r'^www\.', '', website_clean)
-        
-        # Remove path and query parameters
-        website_clean = website_clean.split('/')[0]
-        website_clean = website_clean.split('?')[0]
-        
-        # Handle specific streaming service domains
-        domain_mappings = {
-            'hbomax.com': 'max.com',
-            'disneyplus.com': 'disneyplus.com',
-            'netflix.com': 'netflix.com',
-            'hulu.com': 'hulu.com',
-            'primevideo.com': 'primevideo.com',
-            'peacocktv.com': 'peacocktv.com',
-            'paramountplus.com': 'paramountplus.com',
-            'tv.apple.com': 'tv.apple.com',
-            'plus.espn.com': 'plus.espn.com',
-            'servustv.com': 'servustv.com'
-        }
-        
-        # Return mapped domain or cleaned version
-        for pattern, replacement in domain_mappings.items():
-            if pattern in website_clean:
-                return f"https://{replacement}"
-        
-        # Ensure https:// prefix
-        if not website_clean.startswith(('http://', 'https://')):
-            website_clean = f"https://{website_clean}"
-        
-        return website_clean
+        return _normalize_website_url(website)
+    
+    def normalize_website_urls(self, websites):
+        """Normalize a batch of website URLs, computing each distinct URL once."""
+        url_map = {website: self.normalize_website_url(website) for website in set(websites)}
+        return [url_map[website] for website in websites]
     
     def normalize_channel_name(self, channel):
         """Normalize channel name for consistent formatting."""
-        if not channel:
-            return "unknown"
-        
-        # Remove special characters and spaces
-        channel_clean = re.sub(r'[^\w\s-]', '', channel)
-        channel_clean = re.sub(r'[-\s]+', '-', channel_clean)
-        
-        # Convert to slug format
-        channel_slug = slugify(channel_clean)
-        
-        # Handle specific channel mappings
-        channel_mappings = {
-            'hbo-max': 'HBO Max',
-            'disney-plus': 'Disney+',
-            'disney': 'Disney',
-            'netflix': 'Netflix',
-            'hulu': 'Hulu',
-            'amazon-prime': 'Prime Video',
-            'prime-video': 'Prime Video',
-            'peacock': 'Peacock',
-            'paramount-plus': 'Paramount+',
-            'paramount': 'Paramount',
-            'apple-tv': 'Apple TV',
-            'espn': 'ESPN',
-            'espn-plus': 'ESPN+',
-            'showtime': 'Showtime',
-            'starz': 'Starz',
-            'amc': 'AMC',
-            'amc-plus': 'AMC+',
-            'discovery': 'Discovery',
-            'discovery-plus': 'Discovery+',
-            'servustv': 'ServusTV',
-            'bbc': 'BBC',
-            'fox': 'FOX',
-            'nbc': 'NBC',
-            'abc': 'ABC',
-            'cbs': 'CBS'
-        }
-        
-        # Return mapped channel or original
-        return channel_mappings.get(channel_slug, channel)
+        return _normalize_channel_name(channel)
 
 
 # Example usage function
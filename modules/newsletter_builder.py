@@ -1,51 +1,33 @@
 import logging
+import re
+from html import escape
 from datetime import datetime
-from typing import List, Dict
-from collections import defaultdict
+from functools import lru_cache
+from typing import List, Dict, Iterator, Tuple
+from itertools import groupby
+from operator import itemgetter
 from .channel_manager import ChannelManager
 
 logger = logging.getLogger(__name__)
 
-class NewsletterBuilder:
-    """Build HTML newsletter from components."""
-    
-    def __init__(self):
-        self.template = self._load_template()
-        self.channel_manager = ChannelManager()
-        self.missing_channels = []  # Track channels that need website info
-    
-    def build(self, banner_url: str, tagline: str, introduction: str, 
-              content_items: List[Dict], date_range: Dict) -> str:
-        """Build complete newsletter HTML."""
-        try:
-            # Group content by date
-            grouped_content = self._group_by_date(content_items)
-            
-            # Generate content sections
-            content_html = self._generate_content_sections(grouped_content)
-            
-            # Get month for title
-            start_date = datetime.strptime(date_range['start'], '%Y-%m-%d')
-            month_year = start_date.strftime('%B %Y')
-            
-            # Replace placeholders in template
-            newsletter_html = self.template
-            newsletter_html = newsletter_html.replace('{{TITLE}}', f'Streaming Updates for {month_year}')
-            newsletter_html = newsletter_html.replace('{{BANNER_URL}}', banner_url)
-            newsletter_html = newsletter_html.replace('{{TAGLINE}}', tagline)
-            newsletter_html = newsletter_html.replace('{{INTRODUCTION}}', introduction)
-            newsletter_html = newsletter_html.replace('{{CONTENT_SECTIONS}}', content_html)
-            newsletter_html = newsletter_html.replace('{{CURRENT_YEAR}}', str(datetime.now().year))
-            
-            return newsletter_html
-            
-        except Exception as e:
-            logger.error(f"Error building newsletter: {str(e)}")
-            return self._get_error_template()
-    
-    def _load_template(self) -> str:
-        """Load base HTML template."""
-        return '''<!DOCTYPE html>
+_PLACEHOLDER_RE = re.compile(r'\{\{(TITLE|BANNER_URL|TAGLINE|INTRODUCTION|CURRENT_YEAR)\}\}')
+
+@lru_cache(maxsize=4)
+def _split_template(template: str) -> Tuple[str, str]:
+    """Split a template into the header and footer around its content sections."""
+    header, footer = template.split('{{CONTENT_SECTIONS}}', 1)
+    return header, footer
+
+@lru_cache(maxsize=512)
+def _date_header(date_str: str) -> str:
+    """Format a YYYY-MM-DD date as a section header, e.g. 'FRIDAY, AUGUST 21'."""
+    try:
+        date_obj = datetime.fromisoformat(date_str)
+        return date_obj.strftime('%A, %B %d').upper()
+    except ValueError:
+        return date_str
+
+_TEMPLATE = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -172,144 +154,238 @@ class NewsletterBuilder:
     </div>
 </body>
 </html>'''
-    
-    def _group_by_date(self, content_items: List[Dict]) -> Dict[str, List[Dict]]:
-        """Group content items by date."""
-        grouped = defaultdict(list)
-        
-        for item in content_items:
-            date_str = item.get('date', '')
-            if date_str:
-                grouped[date_str].append(item)
-        
-        # Sort by date
-        return dict(sorted(grouped.items()))
-    
-    def _generate_content_sections(self, grouped_content: Dict[str, List[Dict]]) -> str:
-        """Generate HTML for all content sections."""
-        sections_html = []
-        
-        for date_str, items in grouped_content.items():
-            # Format date header
-            try:
-                date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                formatted_date = date_obj.strftime('%A, %B %d').upper()
-            except:
-                formatted_date = date_str
-            
-            # Generate section HTML
-            section_html = f'''
-            <div class="date-section" style="font-family: 'Helvetica Neue', Arial, sans-serif;">
-                <h3 style="margin: 0; color: #3B108E; font-size: 20px; font-family: Helvetica, Arial, sans-serif, Tahoma, Geneva, Verdana, sans-serif; margin-bottom: 1px; position: relative; display: inline-block; padding-bottom: 5px;">
-                    {formatted_date}
+
+_ERROR_TEMPLATE = '''
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>Error</title>
+        </head>
+        <body>
+            <div style="text-align: center; padding: 50px;">
+                <h1>Newsletter Generation Error</h1>
+                <p>An error occurred while generating your newsletter. Please try again.</p>
+            </div>
+        </body>
+        </html>'''
+
+# Used for any field a scraped item does not have
+_ITEM_DEFAULTS = {
+    'name': 'Untitled',
+    'description': 'Check out this amazing content available for streaming.',
+    'channel': 'Streaming',
+    'channel_image': '',
+    'show_image': 'https://via.placeholder.com/180x120'
+}
+
+# Inline styles shared by every rendered section and item
+_STYLES = {
+    'date_section': "font-family: 'Helvetica Neue', Arial, sans-serif;",
+    'date_header': 'margin: 0; color: #3B108E; font-size: 20px; font-family: Helvetica, Arial, sans-serif, Tahoma, Geneva, Verdana, sans-serif; margin-bottom: 1px; position: relative; display: inline-block; padding-bottom: 5px;',
+    'movie_list': 'background-color: #fff; border-radius: 8px; padding: 15px; padding-left: 0px; padding-right: 0px;',
+    'item_row': 'background-color: #f3f1ff; border-radius: 8px; overflow: hidden;',
+    'movie_card': 'background-color: #f3f1ff; overflow: hidden; display: flex; align-items: center; transition: transform 0.3s, box-shadow 0.3s;',
+    'show_image': 'width: 180px; height: 120px; border-radius: 8px; align-items: center; object-fit: cover; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.3);',
+    'movie_info': 'margin-left: 15px; margin-right: 15px; text-align: left;',
+    'title': 'font-family: Helvetica, Arial, sans-serif, Tahoma, Geneva, Verdana, sans-serif; font-size: 18px; color: #333;',
+    'description': 'text-align: left; font-size: 14px; font-family: Helvetica, Arial, sans-serif; line-height: 1.5; color: #333; text-align: justify; margin-bottom: 20px;',
+    'watch_now_row': 'height: 15px; background: #f3f1ff; transition: transform 0.3s, box-shadow 0.3s;',
+    'watch_now': 'font-family: Helvetica, Arial, sans-serif, Tahoma, Geneva, Verdana, sans-serif; display: block; width: 100%; padding: 14px 20px; background-color: #6d3db9; color: white; text-decoration: none; text-align: center; font-size: 16px; font-weight: bold; border-radius: 30px; margin-top: 10px; box-sizing: border-box; transition: background 0.3s ease, transform 0.3s ease;',
+    'channel_logo': 'max-width: 50px; height: auto; margin-right: 10px; object-fit: cover; border-radius: 8px; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.3); vertical-align: middle;',
+    'channel_label': 'font-family: Helvetica, Arial, sans-serif; font-size: 14px; color: #555; line-height: 1; margin-top: 8px'
+}
+
+_SECTION_TEMPLATE = f'''
+            <div class="date-section" style="{_STYLES["date_section"]}">
+                <h3 style="{_STYLES["date_header"]}">
+                    {{formatted_date}}
                 </h3>
-                <table class="movie-list" border="0" cellspacing="0" cellpadding="10" width="100%" style="background-color: #fff; border-radius: 8px; padding: 15px; padding-left: 0px; padding-right: 0px;">
+                <table class="movie-list" border="0" cellspacing="0" cellpadding="10" width="100%" style="{_STYLES["movie_list"]}">
                     <tbody>
-                        {self._generate_items_html(items)}
+                        {{items_html}}
                     </tbody>
                 </table>
             </div>'''
-            
-            sections_html.append(section_html)
-        
-        return '\n'.join(sections_html)
-    
-    def _generate_items_html(self, items: List[Dict]) -> str:
-        """Generate HTML for individual content items."""
-        items_html = []
-        
-        for item in items:
-            # Extract item data with defaults
-            name = item.get('name', 'Untitled')
-            description = item.get('description', 'Check out this amazing content available for streaming.')
-            channel = item.get('channel', 'Streaming')
-            channel_image = item.get('channel_image', '')
-            show_image = item.get('show_image', 'https://via.placeholder.com/180x120')
-            
-            # Get direct website URL for the channel
-            website_url, missing_channel = self.channel_manager.get_channel_website(channel)
-            if website_url:
-                watch_now_link = website_url
-            else:
-                # Track missing channel for later prompting
-                if missing_channel and missing_channel not in self.missing_channels:
-                    self.missing_channels.append(missing_channel)
-                # Fallback to a default link if channel not found
-                logger.warning(f"No website URL for channel '{channel}', using fallback")
-                watch_now_link = '#'
-            
-            # Truncate description if too long
-            if len(description) > 200:
-                description = description[:197] + '...'
-            
-            # Generate item HTML
-            item_html = f'''
-            <tr style="background-color: #f3f1ff; border-radius: 8px; overflow: hidden;">
-                <td class="movie-card" style="background-color: #f3f1ff; overflow: hidden; display: flex; align-items: center; transition: transform 0.3s, box-shadow 0.3s;">
-                    <img src="{show_image}" alt="{name}" style="width: 180px; height: 120px; border-radius: 8px; align-items: center; object-fit: cover; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.3);">
-                    <div class="movie-info" style="margin-left: 15px; margin-right: 15px; text-align: left;">
-                        <strong style="font-family: Helvetica, Arial, sans-serif, Tahoma, Geneva, Verdana, sans-serif; font-size: 18px; color: #333;">
-                            {name}
+
+_ITEM_TEMPLATE = f'''
+            <tr style="{_STYLES["item_row"]}">
+                <td class="movie-card" style="{_STYLES["movie_card"]}">
+                    <img src="{{show_image}}" alt="{{name}}" style="{_STYLES["show_image"]}">
+                    <div class="movie-info" style="{_STYLES["movie_info"]}">
+                        <strong style="{_STYLES["title"]}">
+                            {{name}}
                         </strong>
-                        <p style="text-align: left; font-size: 14px; font-family: Helvetica, Arial, sans-serif; line-height: 1.5; color: #333; text-align: justify; margin-bottom: 20px;">
-                            {description}
+                        <p style="{_STYLES["description"]}">
+                            {{description}}
                         </p>
                         <div style="display: flex;">
-                            {self._generate_channel_html(channel, channel_image)}
+                            {{channel_html}}
                         </div>
                     </div>
                 </td>
             </tr>
-            <tr style="height: 15px; background: #f3f1ff; transition: transform 0.3s, box-shadow 0.3s;">
+            <tr style="{_STYLES["watch_now_row"]}">
                 <td>
-                    <a href="{watch_now_link}" class="add-to-calendar" style="font-family: Helvetica, Arial, sans-serif, Tahoma, Geneva, Verdana, sans-serif; display: block; width: 100%; padding: 14px 20px; background-color: #6d3db9; color: white; text-decoration: none; text-align: center; font-size: 16px; font-weight: bold; border-radius: 30px; margin-top: 10px; box-sizing: border-box; transition: background 0.3s ease, transform 0.3s ease;">
+                    <a href="{{watch_now_link}}" class="add-to-calendar" style="{_STYLES["watch_now"]}">
                         Watch Now
                     </a>
                 </td>
             </tr>
             <tr style="height: 15px;"></tr>'''
+
+_CHANNEL_WITH_IMAGE_TEMPLATE = f'''
+            <img src="{{channel_image}}" alt="{{channel}} Logo" style="{_STYLES["channel_logo"]}">
+            <span style="{_STYLES["channel_label"]}">
+                Available on: {{channel}}
+            </span>'''
+
+_CHANNEL_NO_IMAGE_TEMPLATE = f'''
+            <span style="{_STYLES["channel_label"]}">
+                Available on: {{channel}}
+            </span>'''
+
+_EMPTY_SECTION = f'''
+            <p style="{_STYLES["description"]}">
+                No new streaming releases were found for this period.
+            </p>'''
+
+# Indexed by whether the channel has a logo image
+_CHANNEL_TEMPLATES = (_CHANNEL_NO_IMAGE_TEMPLATE, _CHANNEL_WITH_IMAGE_TEMPLATE)
+
+class NewsletterBuilder:
+    """Build HTML newsletter from components."""
+    
+    # Per-build state is kept in locals, so these are the only attributes
+    __slots__ = ('template', 'channel_manager', 'missing_channels')
+    
+    def __init__(self):
+        self.template = _TEMPLATE
+        self.channel_manager = ChannelManager()
+        self.missing_channels = {}  # Channels that need website info, in first-seen order
+    
+    def build(self, banner_url: str, tagline: str, introduction: str, 
+              content_items: List[Dict], date_range: Dict) -> str:
+        """Build complete newsletter HTML."""
+        try:
+            return ''.join(self._render(banner_url, tagline, introduction, content_items, date_range))
             
-            items_html.append(item_html)
+        except Exception as e:
+            logger.error(f"Error building newsletter: {str(e)}")
+            return _ERROR_TEMPLATE
+    
+    def _render(self, banner_url: str, tagline: str, introduction: str, 
+                content_items: List[Dict], date_range: Dict) -> Iterator[str]:
+        """Render the newsletter as header, one chunk per date section, then footer."""
+        # Group content by date
+        grouped_content = self._group_by_date(content_items) if content_items else []
         
-        return '\n'.join(items_html)
+        # Get month for title
+        start_date = datetime.fromisoformat(date_range['start'])
+        month_year = start_date.strftime('%B %Y')
+        
+        # Replace placeholders in template around the content sections, one scan each
+        subs = {
+            'TITLE': f'Streaming Updates for {month_year}',
+            'BANNER_URL': banner_url,
+            'TAGLINE': tagline,
+            'INTRODUCTION': introduction,
+            'CURRENT_YEAR': str(datetime.now().year)
+        }
+        header, footer = _split_template(self.template)
+        header = _PLACEHOLDER_RE.sub(lambda m: subs[m.group(1)], header)
+        footer = _PLACEHOLDER_RE.sub(lambda m: subs[m.group(1)], footer)
+        
+        yield header
+        
+        if not grouped_content:
+            yield _EMPTY_SECTION
+            yield footer
+            return
+        
+        # Generate content sections, with every channel's link resolved up front
+        channel_links = self._resolve_channel_links(grouped_content)
+        for index, section_html in enumerate(self._iter_content_sections(grouped_content, channel_links)):
+            yield section_html if index == 0 else '\n' + section_html
+        
+        yield footer
+    
+    def _group_by_date(self, content_items: List[Dict]) -> List[Tuple[str, List[Dict]]]:
+        """Group content items by date, in date order, as (date header, items) pairs."""
+        dated = [item for item in content_items if item.get('date')]
+        
+        # ISO dates sort chronologically; the stable sort keeps item order within a day
+        dated.sort(key=itemgetter('date'))
+        return [(_date_header(date_str), list(items)) for date_str, items in groupby(dated, key=itemgetter('date'))]
+    
+    def _resolve_channel_links(self, grouped_content: List[Tuple[str, List[Dict]]]) -> Dict[str, str]:
+        """Map each channel in the newsletter to its Watch Now link in one batch lookup."""
+        channels = [item.get('channel') or _ITEM_DEFAULTS['channel'] for _, items in grouped_content for item in items]
+        
+        channel_links = {}
+        for channel, (website_url, missing_channel) in self.channel_manager.get_channel_websites_bulk(channels).items():
+            if website_url:
+                channel_links[channel] = website_url
+            else:
+                # Track missing channel for later prompting
+                if missing_channel:
+                    self.missing_channels.setdefault(missing_channel)
+                # Fallback to a default link if channel not found
+                logger.warning(f"No website URL for channel '{channel}', using fallback")
+                channel_links[channel] = '#'
+        return channel_links
+    
+    def _iter_content_sections(self, grouped_content: List[Tuple[str, List[Dict]]],
+                               channel_links: Dict[str, str]) -> Iterator[str]:
+        """Generate HTML for each date section in turn."""
+        for formatted_date, items in grouped_content:
+            # Generate section HTML
+            items_html = '\n'.join(self._iter_items_html(items, channel_links))
+            yield _SECTION_TEMPLATE.format_map({
+                'formatted_date': formatted_date,
+                'items_html': items_html
+            })
+    
+    def _iter_items_html(self, items: List[Dict], channel_links: Dict[str, str]) -> Iterator[str]:
+        """Generate HTML for individual content items in turn."""
+        for item in items:
+            # Extract item data; missing, None and empty fields all fall back to the defaults
+            name = item.get('name') or _ITEM_DEFAULTS['name']
+            description = item.get('description') or _ITEM_DEFAULTS['description']
+            channel = item.get('channel') or _ITEM_DEFAULTS['channel']
+            channel_image = item.get('channel_image') or _ITEM_DEFAULTS['channel_image']
+            show_image = item.get('show_image') or _ITEM_DEFAULTS['show_image']
+            
+            # Direct website URL for the channel, resolved before rendering
+            watch_now_link = channel_links[channel]
+            
+            # Truncate description if too long; short ones are used as-is
+            if len(description) > 200:
+                description = description[:197] + '...'
+            
+            # Generate item HTML, escaping scraped text and URLs
+            yield _ITEM_TEMPLATE.format_map({
+                'name': escape(name),
+                'description': escape(description),
+                'show_image': escape(show_image),
+                'watch_now_link': escape(watch_now_link),
+                'channel_html': self._generate_channel_html(channel, channel_image)
+            })
     
     def _generate_channel_html(self, channel: str, channel_image: str) -> str:
         """Generate HTML for channel display."""
-        if channel_image:
-            return f'''
-            <img src="{channel_image}" alt="{channel} Logo" style="max-width: 50px; height: auto; margin-right: 10px; object-fit: cover; border-radius: 8px; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.3); vertical-align: middle;">
-            <span style="font-family: Helvetica, Arial, sans-serif; font-size: 14px; color: #555; line-height: 1; margin-top: 8px">
-                Available on: {channel}
-            </span>'''
-        else:
-            return f'''
-            <span style="font-family: Helvetica, Arial, sans-serif; font-size: 14px; color: #555; line-height: 1; margin-top: 8px">
-                Available on: {channel}
-            </span>'''
+        return _CHANNEL_TEMPLATES[bool(channel_image)].format_map({
+            'channel': escape(channel),
+            'channel_image': escape(channel_image)
+        })
     
     def get_missing_channels(self) -> List[str]:
         """Get list of channels that need website information."""
-        return self.missing_channels
+        return list(self.missing_channels)
     
     def add_channel_website(self, channel: str, website: str, country: str = 'US') -> bool:
         """Add website information for a channel."""
-        success = self.channel_manager.add_channel_to_database(channel, website, country)
-        if success and channel in self.missing_channels:
-            self.missing_channels.remove(channel)
+        # Saved right away: entries made through the UI must survive a worker restart
+        success = self.channel_manager.add_channel_to_database(channel, website, country, flush=True)
+        if success:
+            self.missing_channels.pop(channel, None)
         return success
-    
-    def _get_error_template(self) -> str:
-        """Return error template HTML."""
-        return '''
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Error</title>
-        </head>
-        <body>
-            <div style="text-align: center; padding: 50px;">
-                <h1>Newsletter Generation Error</h1>
-                <p>An error occurred while generating your newsletter. Please try again.</p>
-            </div>
-        </body>
-        </html>'''
\ No newline at end of file
@@ -1,36 +1,50 @@
 import logging
 import os
-import time
 import requests
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from datetime import date, datetime
 import urllib3
 
 # Disable SSL warnings for corporate networks
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.service import Service
 from bs4 import BeautifulSoup
 from config import Config
+from utils.cache import SimpleCache
+from .scraper_base import CalendarScraperBase
 
 logger = logging.getLogger(__name__)
 
-class TVInsiderScraper:
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+class TVInsiderScraper(CalendarScraperBase):
     """Scraper for TVInsider.com calendar content."""
     
+    ITEM_DEFAULTS = {'website_url': '', 'country': 'US'}
+    
     def __init__(self):
-        self.base_url = Config.TVINSIDER_BASE_URL
-        self.timeout = Config.SCRAPING_TIMEOUT
-        self.headless = Config.HEADLESS_BROWSER
+        super().__init__()
         self.scrape_method = Config.SCRAPE_METHOD
         
+        # Kept alive across scrapes so repeat requests skip the TCP/TLS handshake
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['User-Agent'] = _USER_AGENT
+        # Disable SSL verification for corporate networks with self-signed certificates
+        self.session.verify = False
+        
+        self.cache = SimpleCache()
+        
     def _init_driver(self):
         """Initialize Selenium WebDriver with Chrome."""
         options = Options()
+        # Return from get() at DOMContentLoaded; _wait_for_calendar waits for the content itself
+        options.page_load_strategy = 'eager'
         options.add_argument('--ignore-certificate-errors')
         options.add_argument('--ignore-ssl-errors')
         options.add_argument('--disable-gpu')
@@ -41,6 +55,15 @@ class TVInsiderScraper:
         options.add_argument('--allow-running-insecure-content')
         options.add_argument('--log-level=3')
         
+        # Only DOM text and URLs are read, so skip downloading images and other extras
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_argument('--disable-extensions')
+        options.add_argument('--disable-features=TranslateUI')
+        options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.default_content_setting_values.notifications': 2
+        })
+        
         # Add user agent to avoid detection
         options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
         
@@ -88,14 +111,28 @@ class TVInsiderScraper:
     
     def scrape_date_range(self, start_date, end_date):
         """Scrape content from TVInsider calendar for specific date range."""
-        
+        # Repeat runs for the same range reuse a recent result; today's date is in the key
+        # because yearless calendar dates are resolved relative to it
+        cache_key = f"tvinsider:{self.base_url}:{date.today().isoformat()}:{start_date}:{end_date}"
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached scrape for {start_date} to {end_date}")
+            return cached
+        
+        results = self._scrape_uncached(start_date, end_date)
+        
+        # An empty result may be a page that failed to load, so it isn't kept
+        if results:
+            self.cache.set(cache_key, results, timeout=Config.SCRAPE_CACHE_TIMEOUT)
+        return results
+    
+    def _scrape_uncached(self, start_date, end_date):
+        """Scrape the date range from the live site."""
         # First test if we can reach the website with requests
         try:
             logger.info("Testing network connectivity to TVInsider...")
-            # Disable SSL verification for corporate networks with self-signed certificates
-            response = requests.get(self.base_url, timeout=10, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }, verify=False)
+            # Headers are enough to tell whether the site is up
+            response = self.session.head(self.base_url, timeout=10, allow_redirects=True)
             if response.status_code == 200:
                 logger.info("Network connectivity test successful")
             else:
@@ -119,168 +156,13 @@ class TVInsiderScraper:
     
     def _scrape_by_date_navigation(self, start_date, end_date):
         """Stay on base calendar URL and scrape content using optimized JavaScript extraction."""
-        driver = None
-        
-        try:
-            driver = self._init_driver()
-            
-            # Convert dates for filtering
-            start = datetime.strptime(start_date, '%Y-%m-%d')
-            end = datetime.strptime(end_date, '%Y-%m-%d')
-            current_year = datetime.now().year
-            
-            logger.info(f"Loading calendar page: {self.base_url}")
-            try:
-                driver.get(self.base_url)
-                time.sleep(3)  # Initial load
-            except Exception as e:
-                if "timeout" in str(e).lower():
-                    logger.error(f"Timeout loading page: {str(e)}")
-                    raise Exception("Website timeout: The TVInsider website is not responding. Please try again later.")
-                else:
-                    raise
-            
-            logger.info(f"Scraping content from {start_date} to {end_date}")
-            
-            # Scroll to load content
-            logger.info("Scrolling to load more content...")
-            max_scrolls = 10
-            for i in range(max_scrolls):
-                last_height = driver.execute_script("return document.body.scrollHeight")
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(1.5)
-                new_height = driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    logger.info(f"Reached end after {i+1} scrolls")
-                    break
-            
-            # Extract ALL data in one JavaScript call - OPTIMIZED
-            logger.info("Extracting all data with JavaScript...")
-            all_data = driver.execute_script("""
-                function extractAllData() {
-                    const results = [];
-                    const section = document.querySelector('main section');
-                    if (!section) return results;
-                    
-                    let currentDate = '';
-                    const elements = section.children;
-                    
-                    for (let i = 0; i < elements.length; i++) {
-                        const elem = elements[i];
-                        
-                        // If it's a date header (H6)
-                        if (elem.tagName === 'H6') {
-                            currentDate = elem.textContent.trim();
-                        }
-                        // If it's a show/movie link (A)
-                        else if (elem.tagName === 'A' && currentDate) {
-                            try {
-                                const item = {
-                                    date_header: currentDate,
-                                    name: elem.querySelector('div h3')?.textContent || '',
-                                    type: elem.querySelector('div h5')?.textContent || '',
-                                    description: elem.querySelector('div p')?.textContent || '',
-                                    channel: elem.querySelector('img:first-child')?.alt || '',
-                                    channel_image: elem.querySelector('img:first-child')?.src || '',
-                                    show_image: elem.querySelector('img:nth-child(2)')?.src || '',
-                                    website: elem.href || '',
-                                    website_url: '',
-                                    country: 'US'
-                                };
-                                
-                                // Skip empty items
-                                if (item.name) {
-                                    results.push(item);
-                                }
-                            } catch (e) {
-                                console.error('Error extracting item:', e);
-                            }
-                        }
-                    }
-                    
-                    return results;
-                }
-                
-                return extractAllData();
-            """)
-            
-            logger.info(f"Extracted {len(all_data)} items from page")
-            
-            # Process dates and filter
-            filtered_data = []
-            for item in all_data:
-                # Parse the date header
-                date_text = item.get('date_header', '')
-                parsed_date = self._parse_date_optimized(date_text, current_year)
-                
-                if parsed_date:
-                    item['date'] = parsed_date
-                    
-                    # Filter by date range
-                    try:
-                        item_date = datetime.strptime(parsed_date, '%Y-%m-%d')
-                        if start <= item_date <= end:
-                            # Clean up item
-                            item.pop('date_header', None)  # Remove temporary field
-                            item['channel'] = item['channel'].replace("Parmount+", "Paramount+")
-                            filtered_data.append(item)
-                    except:
-                        pass
-            
-            # Filter out excluded content
-            filtered_data = self._filter_excluded_content(filtered_data)
-            
-            logger.info(f"Filtered to {len(filtered_data)} items in date range")
-            return filtered_data
-            
-        except Exception as e:
-            logger.error(f"Scraping error: {str(e)}")
-            raise
-        finally:
-            if driver:
-                driver.quit()
+        return self._scrape_calendar(start_date, end_date)
     
     def _scrape_full_calendar_and_filter(self, start_date, end_date):
         """Scrape the full calendar page using optimized JavaScript extraction."""
         # Use the same optimized method as _scrape_by_date_navigation
         return self._scrape_by_date_navigation(start_date, end_date)
     
-    def _parse_date_optimized(self, date_text, current_year):
-        """Parse various date formats and return YYYY-MM-DD."""
-        if not date_text:
-            return None
-            
-        date_text = date_text.strip().title()  # Normalize case
-        
-        # Try different date formats
-        formats = [
-            "%A, %B %d, %Y",  # Friday, December 15, 2024
-            "%B %d, %Y",      # December 15, 2024
-            "%A, %B %d",      # Friday, August 21
-            "%B %d"           # August 21
-        ]
-        
-        for fmt in formats:
-            try:
-                date_obj = datetime.strptime(date_text, fmt)
-                
-                # Add year if not present
-                if "%Y" not in fmt:
-                    date_obj = date_obj.replace(year=current_year)
-                    
-                    # Check if date is too far in the past (probably next year)
-                    today = datetime.now()
-                    if date_obj < today - timedelta(days=30):
-                        date_obj = date_obj.replace(year=current_year + 1)
-                
-                return date_obj.strftime("%Y-%m-%d")
-            except:
-                continue
-        
-        return None
-    
-    
-    
     def _filter_by_date_range(self, items, start_date, end_date):
         """Filter items by date range."""
         filtered = []
@@ -307,24 +189,3 @@ class TVInsiderScraper:
             return items
         
         return filtered
-    
-    def _filter_excluded_content(self, items):
-        """Filter out sports and other excluded content."""
-        excluded_keywords = [
-            'Sports', 'VOD / Buy / Rent', 'YouTube', 'Fox Soccer Plus',
-            'ESPN', 'Gold Channel', 'Baseball', 'Cup', 'Football', 'Championship',
-            'WWE', 'NFL', 'Tennis', 'Formula 1', 'NBA', 'Apple TV+', 'Soccer',
-            'Boxing', 'UFC', 'MMA', 'Golf', 'Hockey', 'Cricket', 'Rugby'
-        ]
-        
-        filtered = []
-        for item in items:
-            # Check if any excluded keyword is in name, type, or channel
-            content_text = f"{item.get('name', '')} {item.get('type', '')} {item.get('channel', '')}"
-            
-            if not any(keyword.lower() in content_text.lower() for keyword in excluded_keywords):
-                filtered.append(item)
-            else:
-                logger.debug(f"Filtered out: {item.get('name', 'Unknown')}")
-        
-        return filtered
\ No newline at end of file
@@ -0,0 +1,335 @@
+"""
+Calendar scraping shared by the TVInsider scrapers: browser reuse, the in-page
+JavaScript extraction and date/keyword post-processing
+"""
+
+import atexit
+from abc import ABC, abstractmethod
+import logging
+import re
+import threading
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_EXCLUDED_KEYWORDS = [
+    'Sports', 'VOD / Buy / Rent', 'YouTube', 'Fox Soccer Plus',
+    'ESPN', 'Gold Channel', 'Baseball', 'Cup', 'Football', 'Championship',
+    'WWE', 'NFL', 'Tennis', 'Formula 1', 'NBA', 'Apple TV+', 'Soccer',
+    'Boxing', 'UFC', 'MMA', 'Golf', 'Hockey', 'Cricket', 'Rugby'
+]
+
+# One case-insensitive scan per field instead of a lowercase substring test per keyword
+_EXCLUDED_RE = re.compile('|'.join(re.escape(keyword) for keyword in _EXCLUDED_KEYWORDS), re.IGNORECASE)
+
+_MONTHS = {name: number for number, name in enumerate([
+    'january', 'february', 'march', 'april', 'may', 'june', 'july',
+    'august', 'september', 'october', 'november', 'december'
+], start=1)}
+_WEEKDAYS = {'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'}
+
+# "Friday, December 15, 2024", "December 15, 2024", "Friday, August 21" or "August 21"
+_DATE_HEADER_RE = re.compile(
+    r'(?:(?P<weekday>[a-z]+),\s+)?(?P<month>[a-z]+)\s+(?P<day>\d{1,2})(?:,\s+(?P<year>\d{4}))?',
+    re.IGNORECASE
+)
+
+# Runs in the page; filters by date header and excluded keywords before items cross to Python
+_EXTRACT_CALENDAR_JS = r"""
+    function extractAllData(startIso, endIso, excludedKeywords, currentYear, todayIso) {
+        // Returned column-wise so each field name crosses the bridge once
+        const columns = {date_header: [], name: [], type: [], description: [], channel: [],
+                         channel_image: [], show_image: [], website: []};
+        const section = document.querySelector('main section');
+        if (!section) return columns;
+        
+        // Mirrors _parse_date_header; headers it can't read are kept for Python to judge
+        const months = ['january', 'february', 'march', 'april', 'may', 'june', 'july',
+                        'august', 'september', 'october', 'november', 'december'];
+        const pad = n => String(n).padStart(2, '0');
+        const cutoff = new Date(todayIso + 'T00:00:00Z');
+        cutoff.setUTCDate(cutoff.getUTCDate() - 30);
+        const cutoffIso = cutoff.toISOString().slice(0, 10);
+        
+        function headerInRange(header) {
+            const m = header.match(/^(?:[a-z]+,\s*)?([a-z]+)\s+(\d{1,2})(?:,\s*(\d{4}))?$/i);
+            const month = m ? months.indexOf(m[1].toLowerCase()) + 1 : 0;
+            if (!month) return true;
+            
+            const day = pad(parseInt(m[2], 10));
+            let iso = `${m[3] || currentYear}-${pad(month)}-${day}`;
+            // Yearless dates well in the past belong to next year
+            if (!m[3] && iso <= cutoffIso) {
+                iso = `${currentYear + 1}-${pad(month)}-${day}`;
+            }
+            return startIso <= iso && iso <= endIso;
+        }
+        
+        function isExcluded(text) {
+            text = text.toLowerCase();
+            return excludedKeywords.some(keyword => text.includes(keyword));
+        }
+        
+        let currentDate = '';
+        let inRange = false;
+        const elements = section.children;
+        
+        for (let i = 0; i < elements.length; i++) {
+            const elem = elements[i];
+            
+            // If it's a date header (H6)
+            if (elem.tagName === 'H6') {
+                currentDate = elem.textContent.trim();
+                inRange = headerInRange(currentDate);
+            }
+            // If it's a show/movie link (A) under a header in the requested range
+            else if (elem.tagName === 'A' && currentDate && inRange) {
+                try {
+                    const item = {
+                        date_header: currentDate,
+                        name: elem.querySelector('div h3')?.textContent || '',
+                        type: elem.querySelector('div h5')?.textContent || '',
+                        description: elem.querySelector('div p')?.textContent || '',
+                        channel: elem.querySelector('img:first-child')?.alt || '',
+                        channel_image: elem.querySelector('img:first-child')?.src || '',
+                        show_image: elem.querySelector('img:nth-child(2)')?.src || '',
+                        website: elem.href || ''
+                    };
+                    
+                    // Skip empty and excluded items before they cross to Python
+                    if (item.name && !isExcluded(item.name) && !isExcluded(item.type)
+                            && !isExcluded(item.channel)) {
+                        for (const key in columns) columns[key].push(item[key]);
+                    }
+                } catch (e) {
+                    console.error('Error extracting item:', e);
+                }
+            }
+        }
+        
+        return columns;
+    }
+    
+    return extractAllData(...arguments);
+"""
+
+@lru_cache(maxsize=512)
+def _parse_date_header(date_text, current_year, today):
+    """Parse a calendar date header into YYYY-MM-DD, relative to `today` for yearless dates."""
+    if not date_text:
+        return None
+    
+    match = _DATE_HEADER_RE.fullmatch(date_text.strip())
+    if not match:
+        return None
+    
+    weekday, month, day, year = match.group('weekday', 'month', 'day', 'year')
+    month = _MONTHS.get(month.lower())
+    if month is None or (weekday and weekday.lower() not in _WEEKDAYS):
+        return None
+    
+    try:
+        date_obj = date(int(year) if year else current_year, month, int(day))
+        
+        # Check if a yearless date is too far in the past (probably next year)
+        if not year and date_obj <= today - timedelta(days=30):
+            date_obj = date_obj.replace(year=current_year + 1)
+    except ValueError:
+        # No such day, e.g. February 30
+        return None
+    
+    return date_obj.isoformat()
+
+class CalendarScraperBase(ABC):
+    """Scrapes the TVInsider calendar page with one reused Chrome instance. Subclasses build the driver."""
+    
+    # Extra fields added to every extracted item
+    ITEM_DEFAULTS = {}
+    
+    def __init__(self):
+        self.base_url = Config.TVINSIDER_BASE_URL
+        self.timeout = Config.SCRAPING_TIMEOUT
+        self.headless = Config.HEADLESS_BROWSER
+        
+        # One Chrome instance is reused across scrapes; Selenium drivers are not thread-safe
+        self._driver = None
+        self._driver_lock = threading.Lock()
+        atexit.register(self.close)
+    
+    @abstractmethod
+    def _init_driver(self):
+        """Start a new Chrome WebDriver."""
+    
+    def _acquire_driver(self):
+        """Take the shared browser, starting Chrome on first use. Pair with _release_driver()."""
+        self._driver_lock.acquire()
+        try:
+            if self._driver is not None:
+                try:
+                    # Reset state left by the previous scrape
+                    self._driver.delete_all_cookies()
+                except WebDriverException:
+                    logger.warning("Reused Chrome driver is unresponsive, restarting it")
+                    self._quit_driver()
+            if self._driver is None:
+                self._driver = self._init_driver()
+            return self._driver
+        except Exception:
+            self._driver_lock.release()
+            raise
+    
+    def _release_driver(self, discard=False):
+        """Return the shared browser, quitting it if it may be in a bad state."""
+        try:
+            if discard:
+                self._quit_driver()
+        finally:
+            self._driver_lock.release()
+    
+    def _quit_driver(self):
+        """Quit the shared browser, ignoring errors from an already dead one."""
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except Exception:
+                pass
+            self._driver = None
+    
+    def close(self):
+        """Shut down the shared browser."""
+        with self._driver_lock:
+            self._quit_driver()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def _scrape_calendar(self, start_date, end_date):
+        """Load the calendar page in the browser and return its items for the date range."""
+        driver = None
+        failed = False
+        
+        try:
+            driver = self._acquire_driver()
+            
+            # Convert dates for filtering
+            start = datetime.strptime(start_date, '%Y-%m-%d')
+            end = datetime.strptime(end_date, '%Y-%m-%d')
+            current_year = datetime.now().year
+            
+            logger.info(f"Loading calendar page: {self.base_url}")
+            try:
+                driver.get(self.base_url)
+            except Exception as e:
+                if "timeout" in str(e).lower():
+                    logger.error(f"Timeout loading page: {str(e)}")
+                    raise Exception("Website timeout: The TVInsider website is not responding. Please try again later.")
+                else:
+                    raise
+            self._wait_for_calendar(driver)
+            
+            logger.info(f"Scraping content from {start_date} to {end_date}")
+            self._scroll_to_end(driver)
+            
+            all_data = self._extract_calendar_items(driver, start, end, current_year)
+            logger.info(f"Extracted {len(all_data)} items from page")
+            
+            return self._process_items(all_data, start, end, current_year)
+        
+        except Exception as e:
+            failed = True
+            logger.error(f"Scraping error: {str(e)}")
+            raise
+        finally:
+            if driver:
+                self._release_driver(discard=failed)
+    
+    def _wait_for_calendar(self, driver):
+        """Wait until the first calendar date header has rendered."""
+        try:
+            WebDriverWait(driver, self.timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, 'main section h6'))
+            )
+        except TimeoutException:
+            # Extraction below finds nothing and returns an empty result
+            logger.warning("Calendar content did not appear before the timeout")
+    
+    def _scroll_to_end(self, driver, max_scrolls=10):
+        """Scroll until the calendar stops loading more days."""
+        logger.info("Scrolling to load more content...")
+        for i in range(max_scrolls):
+            last_height = driver.execute_script("return document.body.scrollHeight")
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            # Continue as soon as more content renders; no growth means we hit the end
+            try:
+                WebDriverWait(driver, 3, poll_frequency=0.1).until(
+                    lambda d: d.execute_script("return document.body.scrollHeight") != last_height
+                )
+            except TimeoutException:
+                logger.info(f"Reached end after {i+1} scrolls")
+                break
+    
+    def _extract_calendar_items(self, driver, start, end, current_year):
+        """Extract ALL in-range calendar items in one JavaScript call."""
+        logger.info("Extracting all data with JavaScript...")
+        columns = driver.execute_script(
+            _EXTRACT_CALENDAR_JS, start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'),
+            [keyword.lower() for keyword in _EXCLUDED_KEYWORDS], current_year, date.today().isoformat()
+        )
+        # Back to one dict per item for the shared post-processing
+        return [dict(zip(columns, row), **self.ITEM_DEFAULTS) for row in zip(*columns.values())]
+    
+    def _process_items(self, all_data, start, end, current_year):
+        """Date, range-filter and clean extracted calendar items."""
+        # Zero-padded ISO dates compare correctly as strings, so items need no datetime
+        start_iso = start.strftime('%Y-%m-%d')
+        end_iso = end.strftime('%Y-%m-%d')
+        
+        filtered_data = []
+        for item in all_data:
+            # Parse the date header
+            date_text = item.get('date_header', '')
+            parsed_date = self._parse_date(date_text, current_year)
+            
+            if parsed_date:
+                item['date'] = parsed_date
+                
+                # Filter by date range
+                if start_iso <= parsed_date <= end_iso:
+                    # Clean up item
+                    item.pop('date_header', None)  # Remove temporary field
+                    item['channel'] = item['channel'].replace("Parmount+", "Paramount+")
+                    filtered_data.append(item)
+        
+        # Filter out excluded content
+        filtered_data = self._filter_excluded_content(filtered_data)
+        
+        logger.info(f"Filtered to {len(filtered_data)} items in date range")
+        return filtered_data
+    
+    def _parse_date(self, date_text, current_year):
+        """Parse various date formats and return YYYY-MM-DD."""
+        # Many items share one date header, so each header is parsed once per day
+        return _parse_date_header(date_text, current_year, date.today())
+    
+    def _filter_excluded_content(self, items):
+        """Filter out sports and other excluded content."""
+        filtered = []
+        for item in items:
+            # Check if any excluded keyword is in name, type, or channel
+            if not (_EXCLUDED_RE.search(item.get('name', ''))
+                    or _EXCLUDED_RE.search(item.get('type', ''))
+                    or _EXCLUDED_RE.search(item.get('channel', ''))):
+                filtered.append(item)
+            else:
+                logger.debug(f"Filtered out: {item.get('name', 'Unknown')}")
+        
+        return filtered
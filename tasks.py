@@ -0,0 +1,27 @@
+"""
+Background jobs executed by the RQ worker (run with: rq worker banners)
+"""
+
+import logging
+from typing import Dict, List
+from config import Config
+from modules.image_generator import ImageGenerator
+from utils.session_store import SessionStore
+
+logger = logging.getLogger(__name__)
+
+image_generator = ImageGenerator(Config.FLUX_API_KEY, Config.FLUX_API_URL)
+session_store = SessionStore()
+
+def generate_banners_job(session_id: str, tagline: str, theme_context: List[Dict]) -> List[str]:
+    """Generate banner variations and store them in the user's session."""
+    logger.info(f"Generating banners for session: {session_id}")
+    
+    banners = image_generator.generate_banners(
+        tagline=tagline,
+        theme_context=theme_context
+    )
+    
+    session_store.update(session_id, {'banners': banners})
+    
+    return banners
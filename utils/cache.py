@@ -1,98 +1,91 @@
 import time
-import hashlib
-import json
 import os
+import sqlite3
+import threading
+from collections import deque
 from typing import Any, Optional
+
+import msgpack
+
 from config import Config
 
 class SimpleCache:
-    """Simple file-based cache implementation."""
+    """Simple SQLite-backed cache, safe to share between threads and processes."""
     
     def __init__(self, cache_dir: str = None):
         self.cache_dir = cache_dir or os.path.join(Config.TEMP_FOLDER, 'cache')
         os.makedirs(self.cache_dir, exist_ok=True)
         self.default_timeout = Config.CACHE_DEFAULT_TIMEOUT
+        self.db_path = os.path.join(self.cache_dir, 'cache.sqlite3')
+        # One connection per process, serialized by a lock. Thread-locals would give
+        # every gevent greenlet its own connection
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value BLOB NOT NULL, expiry REAL NOT NULL, created REAL NOT NULL)'
+        )
+        # Lets cleanup_expired() find expired rows without reading every value
+        self._execute('CREATE INDEX IF NOT EXISTS cache_expiry ON cache (expiry)')
     
-    def _get_cache_key(self, key: str) -> str:
-        """Generate cache file path from key."""
-        # Hash the key to create a valid filename
-        key_hash = hashlib.md5(key.encode()).hexdigest()
-        return os.path.join(self.cache_dir, f"{key_hash}.cache")
+    def _connection(self) -> sqlite3.Connection:
+        """Get this process's connection, opening it on first use or after a fork. Call with the lock held."""
+        if self._conn is None or self._pid != os.getpid():
+            # Autocommit: every statement is its own atomic transaction
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None, check_same_thread=False)
+            # WAL lets readers proceed while another process writes
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+    
+    def _execute(self, sql: str, params: tuple = ()) -> list:
+        """Run one statement on the shared connection and return its rows."""
+        with self._lock:
+            return self._connection().execute(sql, params).fetchall()
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache."""
-        cache_file = self._get_cache_key(key)
-        
-        if not os.path.exists(cache_file):
-            return None
-        
         try:
-            with open(cache_file, 'r') as f:
-                cache_data = json.load(f)
-            
-            # Check if cache has expired
-            if cache_data['expiry'] < time.time():
-                os.remove(cache_file)
+            rows = self._execute(
+                'SELECT value FROM cache WHERE key = ? AND expiry > ?',
+                (key, time.time())
+            )
+            if not rows:
                 return None
+            return msgpack.unpackb(rows[0][0], raw=False)
             
-            return cache_data['value']
-            
-        except (json.JSONDecodeError, KeyError, IOError):
-            # Invalid cache file, remove it
-            if os.path.exists(cache_file):
-                os.remove(cache_file)
+        except (sqlite3.Error, msgpack.UnpackException, ValueError, TypeError):
+            # Unreadable entry (e.g. written in an older format): treat as a miss
             return None
     
     def set(self, key: str, value: Any, timeout: int = None) -> None:
         """Set value in cache with optional timeout."""
-        cache_file = self._get_cache_key(key)
         timeout = timeout or self.default_timeout
-        
-        cache_data = {
-            'value': value,
-            'expiry': time.time() + timeout,
-            'created': time.time()
-        }
+        now = time.time()
         
         try:
-            with open(cache_file, 'w') as f:
-                json.dump(cache_data, f)
-        except IOError:
+            self._execute(
+                'INSERT OR REPLACE INTO cache (key, value, expiry, created) VALUES (?, ?, ?, ?)',
+                (key, msgpack.packb(value, use_bin_type=True), now + timeout, now)
+            )
+        except sqlite3.Error:
             # Silently fail if can't write cache
             pass
     
     def delete(self, key: str) -> None:
         """Delete value from cache."""
-        cache_file = self._get_cache_key(key)
-        if os.path.exists(cache_file):
-            os.remove(cache_file)
+        self._execute('DELETE FROM cache WHERE key = ?', (key,))
     
     def clear(self) -> None:
-        """Clear all cache files."""
-        for filename in os.listdir(self.cache_dir):
-            if filename.endswith('.cache'):
-                os.remove(os.path.join(self.cache_dir, filename))
+        """Clear all cached values."""
+        self._execute('DELETE FROM cache')
     
     def cleanup_expired(self) -> None:
-        """Remove expired cache files."""
-        current_time = time.time()
-        
-        for filename in os.listdir(self.cache_dir):
-            if not filename.endswith('.cache'):
-                continue
-            
-            filepath = os.path.join(self.cache_dir, filename)
-            
-            try:
-                with open(filepath, 'r') as f:
-                    cache_data = json.load(f)
-                
-                if cache_data.get('expiry', 0) < current_time:
-                    os.remove(filepath)
-                    
-            except (json.JSONDecodeError, KeyError, IOError):
-                # Invalid cache file, remove it
-                os.remove(filepath)
+        """Remove expired cache entries."""
+        self._execute('DELETE FROM cache WHERE expiry <= ?', (time.time(),))
 
 
 class RateLimiter:
@@ -101,30 +94,51 @@ class RateLimiter:
     def __init__(self, max_calls: int, period: int):
         self.max_calls = max_calls
         self.period = period  # in seconds
-        self.calls = []
+        self.calls = deque()  # Call times, oldest first
+        self.resume_at = 0.0
+        self._lock = threading.Lock()
     
     def is_allowed(self) -> bool:
         """Check if a new call is allowed."""
-        now = time.time()
-        
-        # Remove old calls outside the period
-        self.calls = [call_time for call_time in self.calls 
-                     if now - call_time < self.period]
-        
-        # Check if we can make a new call
-        if len(self.calls) < self.max_calls:
-            self.calls.append(now)
-            return True
-        
-        return False
+        with self._lock:
+            now = time.time()
+            
+            # Remove old calls outside the period
+            while self.calls and now - self.calls[0] >= self.period:
+                self.calls.popleft()
+            
+            # Check if we can make a new call
+            if len(self.calls) < self.max_calls:
+                self.calls.append(now)
+                return True
+            
+            return False
     
     def wait_time(self) -> float:
         """Get time to wait before next call is allowed."""
-        if len(self.calls) < self.max_calls:
-            return 0
-        
-        now = time.time()
-        oldest_call = min(self.calls)
-        wait = self.period - (now - oldest_call)
-        
-        return max(0, wait)
\ No newline at end of file
+        with self._lock:
+            if len(self.calls) < self.max_calls:
+                return 0
+            
+            now = time.time()
+            oldest_call = self.calls[0]
+            wait = self.period - (now - oldest_call)
+            
+            return max(0, wait)
+    
+    def defer(self, seconds: float) -> None:
+        """Hold back every caller of acquire() for `seconds`, e.g. after a 429."""
+        with self._lock:
+            self.resume_at = max(self.resume_at, time.time() + seconds)
+    
+    def acquire(self) -> None:
+        """Block until a call is allowed. Returns immediately while under the limit."""
+        while True:
+            with self._lock:
+                pause = self.resume_at - time.time()
+            if pause > 0:
+                time.sleep(pause)
+            elif self.is_allowed():
+                return
+            else:
+                time.sleep(self.wait_time())
@@ -0,0 +1,39 @@
+import decimal
+from typing import Any, Union
+
+import orjson
+from flask.json.provider import JSONProvider
+
+def _default(obj: Any) -> Any:
+    """Serialize types orjson does not handle natively."""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider that encodes with orjson."""
+    
+    option = orjson.OPT_NON_STR_KEYS
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = self.option
+        if kwargs.get('sort_keys'):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option).decode('utf-8')
+    
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any):
+        """Build a JSON response from bytes directly, skipping the str round-trip."""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=self.option),
+            mimetype='application/json'
+        )
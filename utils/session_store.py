@@ -0,0 +1,94 @@
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import msgpack
+import redis
+from cachetools import TTLCache
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Shared by every store in the process when Redis is not configured. Bounded
+# so abandoned sessions (scraped data, rendered HTML) are reclaimed.
+_local_sessions = TTLCache(maxsize=Config.SESSION_MAX, ttl=Config.SESSION_TTL)
+_local_lock = threading.Lock()
+
+class SessionStore:
+    """Per-user session storage backed by Redis with TTL eviction."""
+
+    def __init__(self, redis_url: str = None, ttl: int = None, prefix: str = 'sess:'):
+        self.ttl = ttl or Config.SESSION_TTL
+        self.prefix = prefix
+        self.redis = None
+        self._local = _local_sessions
+
+        redis_url = redis_url or Config.REDIS_URL
+        if redis_url:
+            pool = redis.ConnectionPool.from_url(
+                redis_url,
+                max_connections=Config.REDIS_MAX_CONNECTIONS
+            )
+            self.redis = redis.Redis(connection_pool=pool)
+            logger.info("Session store using Redis")
+        else:
+            # Single-process fallback for local development
+            logger.warning("REDIS_URL not set, sessions are kept in process memory")
+
+    def _key(self, session_id: str) -> str:
+        """Build the Redis key for a session."""
+        return f"{self.prefix}{session_id}"
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get session data, or None if the session does not exist."""
+        if self.redis is None:
+            with _local_lock:
+                data = self._local.get(session_id)
+            return dict(data) if data is not None else None
+
+        raw = self.redis.get(self._key(session_id))
+        if raw is None:
+            return None
+        return msgpack.unpackb(raw, raw=False)
+
+    def set(self, session_id: str, data: Dict[str, Any]) -> None:
+        """Replace session data and refresh its TTL."""
+        if self.redis is None:
+            with _local_lock:
+                self._local[session_id] = dict(data)
+            return
+
+        self.redis.setex(
+            self._key(session_id),
+            self.ttl,
+            msgpack.packb(data, use_bin_type=True)
+        )
+
+    def update(self, session_id: str, patch: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge fields into an existing session and return the result."""
+        data = self.get(session_id) or {}
+        data.update(patch)
+        self.set(session_id, data)
+        return data
+
+    def delete(self, session_id: str) -> None:
+        """Remove a session."""
+        if self.redis is None:
+            with _local_lock:
+                self._local.pop(session_id, None)
+        else:
+            self.redis.delete(self._key(session_id))
+
+    def __contains__(self, session_id: str) -> bool:
+        if self.redis is None:
+            with _local_lock:
+                return session_id in self._local
+        return bool(self.redis.exists(self._key(session_id)))
+
+    def local_count(self) -> Optional[int]:
+        """Number of in-process sessions, or None when sessions live in Redis."""
+        if self.redis is not None:
+            return None
+        with _local_lock:
+            return len(self._local)
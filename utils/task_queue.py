@@ -0,0 +1,94 @@
+import importlib
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Union
+
+from cachetools import TTLCache
+from redis import Redis
+from rq import Queue
+from rq.exceptions import NoSuchJobError
+from rq.job import Job
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+def _executor_class():
+    """ThreadPoolExecutor for in-process jobs, on real OS threads even under gevent."""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return ThreadPoolExecutor
+    if not monkey.is_module_patched('threading'):
+        return ThreadPoolExecutor
+    # Patched threads are greenlets, so CPU-bound jobs like banner composition would
+    # block the worker's hub and every other request with it
+    from gevent.threadpool import ThreadPoolExecutor as NativeThreadPoolExecutor
+    return NativeThreadPoolExecutor
+
+class TaskQueue:
+    """Background job queue backed by RQ, with a thread pool fallback."""
+
+    def __init__(self, name: str, redis_url: str = None, max_workers: int = 2):
+        self.name = name
+        self.queue = None
+        self.executor = None
+        # In-process jobs stay pollable for a while after they finish, like RQ results
+        self._jobs = TTLCache(maxsize=Config.SESSION_MAX, ttl=Config.SESSION_TTL)
+        self._jobs_lock = threading.Lock()
+
+        redis_url = redis_url or Config.REDIS_URL
+        if redis_url:
+            self.connection = Redis.from_url(redis_url)
+            self.queue = Queue(name, connection=self.connection)
+            logger.info(f"Task queue '{name}' using RQ")
+        else:
+            # Without Redis there is no external worker, so run jobs in-process
+            self.executor = _executor_class()(max_workers=max_workers, thread_name_prefix=name)
+            logger.warning(f"REDIS_URL not set, task queue '{name}' runs jobs in-process")
+
+    def enqueue(self, func: Union[Callable, str], *args, job_timeout: int = None, **kwargs) -> str:
+        """Queue a job and return its id. `func` may be a dotted path like 'tasks.my_job'."""
+        if self.queue is not None:
+            job = self.queue.enqueue(func, *args, job_timeout=job_timeout, **kwargs)
+            return job.id
+
+        if isinstance(func, str):
+            module_name, _, func_name = func.rpartition('.')
+            func = getattr(importlib.import_module(module_name), func_name)
+
+        job_id = uuid.uuid4().hex
+        future = self.executor.submit(func, *args, **kwargs)
+        with self._jobs_lock:
+            self._jobs[job_id] = future
+        return job_id
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get job status and result, or None if the job is unknown."""
+        if self.queue is not None:
+            try:
+                job = Job.fetch(job_id, connection=self.connection)
+            except NoSuchJobError:
+                return None
+
+            status = job.get_status()
+            return {
+                'status': getattr(status, 'value', status),
+                'result': job.result,
+                'error': job.exc_info.strip().splitlines()[-1] if job.exc_info else None
+            }
+
+        with self._jobs_lock:
+            future = self._jobs.get(job_id)
+        if future is None:
+            return None
+
+        if not future.done():
+            return {'status': 'started' if future.running() else 'queued', 'result': None, 'error': None}
+
+        error = future.exception()
+        if error is not None:
+            return {'status': 'failed', 'result': None, 'error': str(error)}
+        return {'status': 'finished', 'result': future.result(), 'error': None}
@@ -1,13 +1,46 @@
 import re
-from datetime import datetime, timedelta
+import string
+from datetime import date
 from typing import Dict, List, Tuple
 
-def validate_date_range(start_date: str, end_date: str) -> Tuple[bool, str]:
-    """Validate date range for scraping."""
+# Length limits from RFC 5321
+_EMAIL_MAX = 320
+_EMAIL_LOCAL_MAX = 64
+_EMAIL_DOMAIN_MAX = 253
+# Translating with these deletes every allowed character, so anything left is invalid
+_EMAIL_LOCAL_STRIP = str.maketrans('', '', string.ascii_letters + string.digits + '._%+-')
+_EMAIL_DOMAIN_STRIP = str.maketrans('', '', string.ascii_letters + string.digits + '.-')
+# The host.tld prefix is bounded, so matching it costs the same for any input length;
+# everything after the scheme (host included) must then be URL characters
+_URL_SCHEMES = ('http://', 'https://')
+_URL_HOST_RE = re.compile(r'(?:www\.)?[-a-zA-Z0-9@:%._+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b', re.ASCII)
+_URL_CHARS_RE = re.compile(r'[-a-zA-Z0-9()@:%_+.~#?&/=]*$', re.ASCII)
+
+_HTML_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#39;'
+})
+_HTML_SPECIAL_RE = re.compile(r'[&<>"\']')
+
+_REQUIRED_ITEM_FIELDS = frozenset(('name', 'channel', 'date'))
+
+# service -> (required prefix, minimum length exclusive)
+_API_KEY_RULES = {
+    # OpenAI keys typically start with 'sk-'
+    'openai': ('sk-', 20),
+    # Flux API key validation (adjust based on actual format)
+    'flux': ('', 10)
+}
+
+def validate_date_range(start_date: str, end_date: str, today: date = None) -> Tuple[bool, str]:
+    """Validate date range for scraping. Pass `today` to reuse one date across many checks."""
     try:
         # Parse dates
-        start = datetime.strptime(start_date, '%Y-%m-%d')
-        end = datetime.strptime(end_date, '%Y-%m-%d')
+        start = date.fromisoformat(start_date)
+        end = date.fromisoformat(end_date)
         
         # Check if start is before end
         if start > end:
@@ -18,8 +51,7 @@ def validate_date_range(start_date: str, end_date: str) -> Tuple[bool, str]:
             return False, "Date range cannot exceed 30 days"
         
         # Check if dates are not too far in the future
-        max_future = datetime.now() + timedelta(days=90)
-        if end > max_future:
+        if (end - (today or date.today())).days > 90:
             return False, "End date cannot be more than 90 days in the future"
         
         return True, "Valid date range"
@@ -29,64 +61,69 @@ def validate_date_range(start_date: str, end_date: str) -> Tuple[bool, str]:
 
 def validate_email(email: str) -> bool:
     """Validate email address format."""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    if len(email) > _EMAIL_MAX:
+        return False
+    local, sep, domain = email.rpartition('@')
+    if not sep or not 0 < len(local) <= _EMAIL_LOCAL_MAX or local.translate(_EMAIL_LOCAL_STRIP):
+        return False
+    
+    host, dot, tld = domain.rpartition('.')
+    if not dot or not 0 < len(host) <= _EMAIL_DOMAIN_MAX or host.translate(_EMAIL_DOMAIN_STRIP):
+        return False
+    return 2 <= len(tld) <= 24 and tld.isascii() and tld.isalpha()
 
 def validate_url(url: str) -> bool:
     """Validate URL format."""
-    pattern = r'^https?:\/\/(www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b([-a-zA-Z0-9()@:%_\+.~#?&\/\/=]*)$'
-    return re.match(pattern, url) is not None
+    if not url.startswith(_URL_SCHEMES):
+        return False
+    start = url.index('//') + 2
+    return _URL_HOST_RE.match(url, start) is not None and _URL_CHARS_RE.match(url, start) is not None
 
 def sanitize_html(text: str) -> str:
     """Sanitize text for HTML output."""
     if not text:
         return ""
     
-    # Escape HTML special characters
-    text = text.replace('&', '&amp;')
-    text = text.replace('<', '&lt;')
-    text = text.replace('>', '&gt;')
-    text = text.replace('"', '&quot;')
-    text = text.replace("'", '&#39;')
+    # Most scraped names and descriptions have nothing to escape
+    if not _HTML_SPECIAL_RE.search(text):
+        return text
     
-    return text
+    # Escape HTML special characters in a single pass
+    return text.translate(_HTML_ESCAPE_TABLE)
 
 def validate_api_key(api_key: str, service: str) -> bool:
     """Validate API key format for different services."""
     if not api_key:
         return False
     
-    if service == 'openai':
-        # OpenAI keys typically start with 'sk-'
-        return api_key.startswith('sk-') and len(api_key) > 20
-    elif service == 'flux':
-        # Flux API key validation (adjust based on actual format)
-        return len(api_key) > 10
-    
-    return False
+    rule = _API_KEY_RULES.get(service)
+    if rule is None:
+        return False
+    prefix, min_length = rule
+    return api_key.startswith(prefix) and len(api_key) > min_length
 
 def validate_scraped_item(item: Dict) -> bool:
     """Validate a scraped content item has required fields."""
-    required_fields = ['name', 'channel', 'date']
-    
-    for field in required_fields:
-        if field not in item or not item[field]:
-            return False
-    
-    return True
+    return _REQUIRED_ITEM_FIELDS <= item.keys() and all(item[field] for field in _REQUIRED_ITEM_FIELDS)
 
 def clean_scraped_data(items: List[Dict]) -> List[Dict]:
-    """Clean and validate scraped data."""
+    """Clean and validate scraped data, returning sanitized copies of the valid items."""
+    # Bound locally to skip global lookups in the per-item loop
+    sanitize = sanitize_html
+    is_valid = validate_scraped_item
     cleaned_items = []
+    append = cleaned_items.append
     
     for item in items:
-        if validate_scraped_item(item):
-            # Sanitize text fields
-            if 'description' in item:
-                item['description'] = sanitize_html(item['description'])
-            if 'name' in item:
-                item['name'] = sanitize_html(item['name'])
-            
-            cleaned_items.append(item)
+        if not is_valid(item):
+            continue
+        
+        # Sanitize text fields on a copy so the caller's items are left as scraped
+        cleaned = dict(item)
+        if 'description' in cleaned:
+            cleaned['description'] = sanitize(cleaned['description'])
+        cleaned['name'] = sanitize(cleaned['name'])
+        
+        append(cleaned)
     
-    return cleaned_items
\ No newline at end of file
+    return cleaned_items